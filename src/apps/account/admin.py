@@ -17,10 +17,16 @@ class CustomUserAdmin(UserAdmin):
     list_per_page = 20
     raw_id_fields = ("subscription_plan",)
     fieldsets = UserAdmin.fieldsets + (
-        (None, {"fields": ("user_type", "subscription_plan")}),
+        (
+            None,
+            {"fields": ("user_type", "subscription_plan", "notification_frequency")},
+        ),
     )
     add_fieldsets = UserAdmin.add_fieldsets + (
-        (None, {"fields": ("user_type", "subscription_plan")}),
+        (
+            None,
+            {"fields": ("user_type", "subscription_plan", "notification_frequency")},
+        ),
     )
 
 
@@ -0,0 +1,30 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.account.tokens import get_token_user
+
+
+class EntitlementJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that, in stateless mode (``ACCOUNT_STATELESS_JWT``),
+    authenticates safe requests from the entitlement claims of the access
+    token instead of loading the user.
+
+    Unsafe requests, and tokens issued before a change of the user or plan
+    entitlement, still load the user from the database. Only the news views
+    use it: the stateless user only knows its entitlement (no ``is_staff``,
+    no permissions).
+    """
+
+    stateless = False
+
+    def authenticate(self, request):
+        self.stateless = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.stateless:
+            user = get_token_user(validated_token)
+            if user is not None:
+                return user
+        return super().get_user(validated_token)
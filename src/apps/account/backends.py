@@ -0,0 +1,16 @@
+from author.backends import AuthorDefaultBackend
+
+from apps.account.middlewares import get_request
+
+
+class AuthorBackend(AuthorDefaultBackend):
+    """
+    django-author backend reading the request stored by AuthorMiddleware.
+    """
+
+    def __init__(self):
+        # The parent only checks that its own middleware is installed
+        pass
+
+    def _get_request(self):
+        return get_request()
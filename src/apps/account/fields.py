@@ -0,0 +1,82 @@
+import operator
+import functools
+
+from django.db import models
+from django.db.models import Case, When, Value
+from django.core.exceptions import EmptyResultSet
+
+
+@functools.cache
+def get_vertical_bits():
+    """
+    Bit of each vertical, in the order of SubscriptionPlan.VERTICAL_CHOICES.
+    """
+    from apps.account.models import SubscriptionPlan
+
+    return {
+        vertical: 1 << position
+        for position, (vertical, _) in enumerate(SubscriptionPlan.VERTICAL_CHOICES)
+    }
+
+
+def get_vertical_mask(verticals):
+    """
+    Bitmask of a list of verticals, unknown verticals are ignored.
+    """
+    bits = get_vertical_bits()
+    mask = 0
+    for vertical in verticals or []:
+        mask |= bits.get(vertical, 0)
+    return mask
+
+
+class VerticalMaskField(models.PositiveSmallIntegerField):
+    """
+    Integer bitmask of verticals, one bit per vertical.
+    """
+
+
+@VerticalMaskField.register_lookup
+class VerticalMaskOverlap(models.Lookup):
+    """
+    ``vertical_mask__overlap=mask``: at least one vertical in common, i.e.
+    ``vertical_mask & mask <> 0``.
+
+    A constant mask is expanded to the list of the masks sharing a bit with
+    it (at most 31 with five verticals), which a btree index can serve,
+    instead of a bitwise AND evaluated on every row.
+    """
+
+    lookup_name = "overlap"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if hasattr(self.rhs, "as_sql"):
+            rhs, rhs_params = self.process_rhs(compiler, connection)
+            return f"({lhs} & {rhs}) <> 0", [*lhs_params, *rhs_params]
+        masks = [
+            mask for mask in range(1, 1 << len(get_vertical_bits())) if mask & self.rhs
+        ]
+        if not masks:
+            raise EmptyResultSet
+        placeholders = ", ".join(["%s"] * len(masks))
+        return f"{lhs} IN ({placeholders})", [*lhs_params, *masks]
+
+
+def get_vertical_mask_field(choices, field_name="verticals"):
+    """
+    Generated column with the bitmask of the ``field_name`` array, computed
+    by the database on every write (bulk and raw writes included).
+    """
+    bits = [
+        Case(
+            When(**{f"{field_name}__contains": [vertical]}, then=Value(1 << position)),
+            default=Value(0),
+        )
+        for position, (vertical, _) in enumerate(choices)
+    ]
+    return models.GeneratedField(
+        expression=functools.reduce(operator.add, bits),
+        output_field=VerticalMaskField(),
+        db_persist=True,
+    )
@@ -0,0 +1,43 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from asgiref.local import Local
+
+_request_local = Local()
+
+
+def get_request():
+    """Get the request being handled in the current thread or task"""
+    return getattr(_request_local, "request", None)
+
+
+class AuthorMiddleware:
+    """
+    Async capable replacement of django-author's middleware.
+
+    The stock middleware is sync only, which makes Django run the whole
+    stack in a thread under ASGI. The request is stored in an asgiref
+    ``Local`` so sync views run through ``sync_to_async`` still see it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        _request_local.request = request
+        try:
+            return self.get_response(request)
+        finally:
+            _request_local.request = None
+
+    async def __acall__(self, request):
+        _request_local.request = request
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_local.request = None
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0002_create_plans_info_pro"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="notification_frequency",
+            field=models.CharField(
+                choices=[
+                    ("immediate", "Imediata"),
+                    ("hourly", "Resumo por hora"),
+                    ("daily", "Resumo diário"),
+                ],
+                default="immediate",
+                max_length=20,
+                verbose_name="Frequência dos alertas",
+            ),
+        ),
+    ]
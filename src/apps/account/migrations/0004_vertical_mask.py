@@ -0,0 +1,67 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:24
+
+import apps.account.fields
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0003_user_notification_frequency"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subscriptionplan",
+            name="vertical_mask",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                models.Case(
+                                    models.When(
+                                        then=models.Value(1),
+                                        verticals__contains=["power"],
+                                    ),
+                                    default=models.Value(0),
+                                ),
+                                "+",
+                                models.Case(
+                                    models.When(
+                                        then=models.Value(2),
+                                        verticals__contains=["tax"],
+                                    ),
+                                    default=models.Value(0),
+                                ),
+                            ),
+                            "+",
+                            models.Case(
+                                models.When(
+                                    then=models.Value(4), verticals__contains=["health"]
+                                ),
+                                default=models.Value(0),
+                            ),
+                        ),
+                        "+",
+                        models.Case(
+                            models.When(
+                                then=models.Value(8), verticals__contains=["energy"]
+                            ),
+                            default=models.Value(0),
+                        ),
+                    ),
+                    "+",
+                    models.Case(
+                        models.When(
+                            then=models.Value(16), verticals__contains=["labor"]
+                        ),
+                        default=models.Value(0),
+                    ),
+                ),
+                output_field=apps.account.fields.VerticalMaskField(),
+            ),
+        ),
+    ]
@@ -7,6 +7,8 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import ArrayField
 
+from apps.account.fields import get_vertical_mask_field
+
 
 @with_author
 class SubscriptionPlan(models_safedelete.SafeDeleteModel):
@@ -39,6 +41,8 @@ class SubscriptionPlan(models_safedelete.SafeDeleteModel):
         blank=True,
         default=list,
     )
+    # Bitmask of verticals, for cheap entitlement matching
+    vertical_mask = get_vertical_mask_field(VERTICAL_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -59,6 +63,14 @@ class User(AbstractUser):
         (WRITER, _("Escritor")),
         (READER, _("Leitor")),
     )
+    IMMEDIATE = "immediate"
+    HOURLY = "hourly"
+    DAILY = "daily"
+    NOTIFICATION_FREQUENCY_CHOICES = (
+        (IMMEDIATE, _("Imediata")),
+        (HOURLY, _("Resumo por hora")),
+        (DAILY, _("Resumo diário")),
+    )
 
     subscription_plan = models.ForeignKey(
         SubscriptionPlan,
@@ -73,6 +85,12 @@ class User(AbstractUser):
         default=READER,
         verbose_name=_("Tipo de usuário"),
     )
+    notification_frequency = models.CharField(
+        max_length=20,
+        choices=NOTIFICATION_FREQUENCY_CHOICES,
+        default=IMMEDIATE,
+        verbose_name=_("Frequência dos alertas"),
+    )
 
     def __str__(self):
         return self.email
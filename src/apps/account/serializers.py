@@ -0,0 +1,14 @@
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer,
+    TokenObtainPairSerializer,
+)
+
+from apps.account.tokens import EntitlementRefreshToken
+
+
+class EntitlementTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = EntitlementRefreshToken
+
+
+class EntitlementTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = EntitlementRefreshToken
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+
+from apps.account.models import User, SubscriptionPlan
+from apps.account.tokens import bump_plan_entitlement, bump_user_entitlement
+
+# Fields copied to (or checked instead of) the access token claims
+ENTITLEMENT_USER_FIELDS = {
+    "user_type",
+    "subscription_plan",
+    "subscription_plan_id",
+    "is_active",
+}
+ENTITLEMENT_PLAN_FIELDS = {"is_exclusive", "verticals"}
+
+
+# Bumped once the change commits: bumped earlier, a token refreshed before
+# the commit would carry the old entitlement under the new version
+def revoke_user(user_id):
+    transaction.on_commit(lambda: bump_user_entitlement(user_id))
+
+
+def revoke_plan(plan_id):
+    transaction.on_commit(lambda: bump_plan_entitlement(plan_id))
+
+
+@receiver(post_save, sender=User)
+def revoke_user_entitlement(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Stop serving the stateless access tokens of a user whose entitlement
+    may have changed.
+    """
+    if created:
+        return
+    if update_fields is not None and not ENTITLEMENT_USER_FIELDS & set(update_fields):
+        return
+    revoke_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_entitlement(sender, instance, **kwargs):
+    revoke_user(instance.pk)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def revoke_plan_entitlement(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Stop serving the stateless access tokens of the subscribers of a plan
+    whose entitlement changed.
+    """
+    if created:
+        return
+    if update_fields is not None and not ENTITLEMENT_PLAN_FIELDS & set(update_fields):
+        return
+    revoke_plan(instance.pk)
+
+
+@receiver(post_delete, sender=SubscriptionPlan)
+def revoke_deleted_plan_entitlement(sender, instance, **kwargs):
+    revoke_plan(instance.pk)
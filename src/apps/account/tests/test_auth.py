@@ -3,9 +3,15 @@ Testes para autenticação JWT
 """
 
 import pytest
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.account.models import SubscriptionPlan
+from apps.account.tokens import get_entitlement_version
 
 User = get_user_model()
 
@@ -97,3 +103,144 @@ class TestJWTAuthentication:
             status.HTTP_200_OK,
             status.HTTP_401_UNAUTHORIZED,
         ]
+
+
+@pytest.mark.django_db
+class TestStatelessJWT:
+    """Testes para o modo de tokens com as permissões do usuário"""
+
+    @pytest.fixture(autouse=True)
+    def stateless(self, settings):
+        settings.ACCOUNT_STATELESS_JWT = True
+
+    def obtain(self, api_client, user):
+        url = reverse("token_obtain_pair")
+        data = {"username": user.username, "password": "testpass123"}
+        return api_client.post(url, data).data
+
+    def list_news(self, api_client, access):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("news-list"))
+        assert response.status_code == status.HTTP_200_OK
+        user_queries = [q for q in queries if "account_user" in q["sql"]]
+        ids = [item["id"] for item in response.data["results"]]
+        return ids, user_queries
+
+    def test_access_token_carries_entitlement(
+        self, api_client, user_with_subscription, subscription_plan
+    ):
+        """Testa que o token de acesso contém o tipo e o plano do usuário"""
+        token = AccessToken(self.obtain(api_client, user_with_subscription)["access"])
+
+        assert token["user_type"] == User.READER
+        assert token["plan_id"] == str(subscription_plan.pk)
+        assert token["plan_verticals"] == subscription_plan.verticals
+        assert token["plan_is_exclusive"] is True
+        assert token["entitlement_version"]
+
+    def test_access_token_without_entitlement_when_disabled(
+        self, settings, api_client, user_reader
+    ):
+        """Testa que o modo é opcional"""
+        settings.ACCOUNT_STATELESS_JWT = False
+        token = AccessToken(self.obtain(api_client, user_reader)["access"])
+
+        assert "entitlement_version" not in token
+
+    def test_news_read_without_loading_user(
+        self, api_client, user_with_subscription, exclusive_news, published_news
+    ):
+        """Testa que a listagem usa apenas o token"""
+        access = self.obtain(api_client, user_with_subscription)["access"]
+
+        ids, user_queries = self.list_news(api_client, access)
+
+        assert ids == [str(exclusive_news.id)]
+        assert user_queries == []
+
+    def test_plan_change_revokes_token(
+        self,
+        api_client,
+        user_with_subscription,
+        exclusive_news,
+        published_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa que a troca de plano vale antes do token expirar"""
+        tokens = self.obtain(api_client, user_with_subscription)
+        user_with_subscription.subscription_plan = None
+        with django_capture_on_commit_callbacks(execute=True):
+            user_with_subscription.save()
+
+        ids, user_queries = self.list_news(api_client, tokens["access"])
+
+        assert ids == [str(published_news.id)]
+        assert user_queries
+
+        # O refresh emite um token com o novo plano
+        api_client.credentials()
+        access = api_client.post(reverse("token_refresh"), tokens).data["access"]
+        assert AccessToken(access)["plan_id"] is None
+        ids, user_queries = self.list_news(api_client, access)
+        assert ids == [str(published_news.id)]
+        assert user_queries == []
+
+    def test_plan_verticals_change_revokes_token(
+        self,
+        api_client,
+        user_with_subscription,
+        subscription_plan,
+        exclusive_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa que a alteração das verticais do plano revoga o token"""
+        access = self.obtain(api_client, user_with_subscription)["access"]
+        subscription_plan.verticals = [SubscriptionPlan.HEALTH]
+        with django_capture_on_commit_callbacks(execute=True):
+            subscription_plan.save()
+
+        ids, user_queries = self.list_news(api_client, access)
+
+        assert ids == []
+        assert user_queries
+
+    def test_writes_load_user(self, api_client, user_writer):
+        """Testa que as escritas continuam carregando o usuário do banco"""
+        access = self.obtain(api_client, user_writer)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = api_client.post(reverse("news-list"), {})
+
+        assert response.wsgi_request.user == user_writer
+        assert isinstance(response.wsgi_request.user, User)
+
+    def test_revoked_on_commit(
+        self, user_with_subscription, django_capture_on_commit_callbacks
+    ):
+        """Testa que a versão só muda após o commit da troca de plano"""
+        before = get_entitlement_version(user_with_subscription.pk)
+
+        user_with_subscription.subscription_plan = None
+        with django_capture_on_commit_callbacks() as callbacks:
+            user_with_subscription.save()
+        assert get_entitlement_version(user_with_subscription.pk) == before
+
+        for callback in callbacks:
+            callback()
+        assert get_entitlement_version(user_with_subscription.pk) != before
+
+    def test_other_views_load_user(self, api_client):
+        """Testa que fora das notícias o usuário vem do banco (ex.: is_staff)"""
+        admin = User.objects.create_user(
+            username="admin_test",
+            email="admin@test.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        access = self.obtain(api_client, admin)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = api_client.get(reverse("schema-json", kwargs={"format": ".json"}))
+
+        assert response.status_code == status.HTTP_200_OK
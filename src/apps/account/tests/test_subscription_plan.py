@@ -6,6 +6,7 @@ from decimal import Decimal
 
 import pytest
 
+from apps.account.fields import get_vertical_mask
 from apps.account.models import SubscriptionPlan
 
 
@@ -84,3 +85,16 @@ class TestSubscriptionPlan:
         assert str(meta.verbose_name) == "Plano de Assinatura"
         assert str(meta.verbose_name_plural) == "Planos de Assinatura"
         assert meta.ordering == ["name"]
+
+    def test_subscription_plan_vertical_mask(self):
+        """Testa a máscara de bits calculada pelo banco a partir dos verticais"""
+        plan = SubscriptionPlan.objects.create(
+            name="Plano Máscara",
+            price=Decimal("9.99"),
+            verticals=[SubscriptionPlan.TAX, SubscriptionPlan.LABOR],
+        )
+        assert plan.vertical_mask == get_vertical_mask(plan.verticals) == 0b10010
+
+        SubscriptionPlan.objects.filter(pk=plan.pk).update(verticals=[])
+        plan.refresh_from_db()
+        assert plan.vertical_mask == 0
@@ -0,0 +1,168 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.account.fields import get_vertical_mask
+
+# Entitlement claims of the access tokens in stateless mode
+USER_TYPE_CLAIM = "user_type"
+PLAN_ID_CLAIM = "plan_id"
+PLAN_VERTICALS_CLAIM = "plan_verticals"
+PLAN_IS_EXCLUSIVE_CLAIM = "plan_is_exclusive"
+ENTITLEMENT_VERSION_CLAIM = "entitlement_version"
+
+USER_VERSION_KEY = "account:entitlement:user:{}"
+PLAN_VERSION_KEY = "account:entitlement:plan:{}"
+
+
+def is_stateless_jwt():
+    """
+    Whether access tokens carry the entitlement of their user, so safe
+    requests are authenticated without loading it.
+    """
+    return getattr(settings, "ACCOUNT_STATELESS_JWT", False)
+
+
+def get_entitlement_version(user_id, plan_id=None):
+    """
+    Return the entitlement version of a user and its plan, one cache read.
+
+    Missing versions start from the clock, so a version lost to eviction
+    never matches a token issued before.
+    """
+    keys = [USER_VERSION_KEY.format(user_id)]
+    if plan_id is not None:
+        keys.append(PLAN_VERSION_KEY.format(plan_id))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return ":".join(str(versions[key]) for key in keys)
+
+
+def bump_version(key):
+    cache.add(key, time.time_ns(), timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr, a fresh version is as good
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_user_entitlement(user_id):
+    bump_version(USER_VERSION_KEY.format(user_id))
+
+
+def bump_plan_entitlement(plan_id):
+    bump_version(PLAN_VERSION_KEY.format(plan_id))
+
+
+def set_entitlement_claims(token, user):
+    """
+    Copy the entitlement of ``user`` (type and plan) to ``token``.
+    """
+    plan = user.subscription_plan
+    token[USER_TYPE_CLAIM] = user.user_type
+    token[PLAN_ID_CLAIM] = str(plan.pk) if plan else None
+    token[PLAN_VERTICALS_CLAIM] = list(plan.verticals) if plan else []
+    token[PLAN_IS_EXCLUSIVE_CLAIM] = plan.is_exclusive if plan else False
+    token[ENTITLEMENT_VERSION_CLAIM] = get_entitlement_version(
+        user.pk, token[PLAN_ID_CLAIM]
+    )
+
+
+class EntitlementRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry the current entitlement of the
+    user in stateless mode, read again from the database on every refresh.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        if not is_stateless_jwt():
+            return access
+        user = getattr(self, "user", None)
+        if user is None:
+            from apps.account.models import User
+
+            user = (
+                User.objects.select_related("subscription_plan")
+                .filter(
+                    **{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]}
+                )
+                .first()
+            )
+        if user is not None:
+            set_entitlement_claims(access, user)
+        return access
+
+
+class TokenSubscriptionPlan:
+    """
+    Entitlement fields of a SubscriptionPlan, read from token claims.
+    """
+
+    def __init__(self, pk, verticals, is_exclusive):
+        self.id = self.pk = pk
+        self.verticals = verticals
+        self.is_exclusive = is_exclusive
+        self.vertical_mask = get_vertical_mask(verticals)
+
+
+class EntitlementUser(TokenUser):
+    """
+    Stateless user backed by an access token carrying entitlement claims,
+    enough for the news read path (NewQuerySet.visible_to, feed scopes).
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token[USER_TYPE_CLAIM]
+
+    @cached_property
+    def subscription_plan(self):
+        if self.token.get(PLAN_ID_CLAIM) is None:
+            return None
+        return TokenSubscriptionPlan(
+            self.token[PLAN_ID_CLAIM],
+            self.token[PLAN_VERTICALS_CLAIM],
+            self.token[PLAN_IS_EXCLUSIVE_CLAIM],
+        )
+
+    @property
+    def subscription_plan_id(self):
+        return self.token.get(PLAN_ID_CLAIM)
+
+    def has_perms(self, perm_list, obj=None):
+        # Like User.has_perms, so requests needing no permission pass
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+
+def get_token_user(token):
+    """
+    Return the stateless user of ``token``, or ``None`` when it must be
+    loaded from the database: stateless mode off, token issued without
+    entitlement claims, or entitlement changed since it was issued.
+    """
+    if not is_stateless_jwt() or ENTITLEMENT_VERSION_CLAIM not in token:
+        return None
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    version = get_entitlement_version(user_id, token.get(PLAN_ID_CLAIM))
+    if token[ENTITLEMENT_VERSION_CLAIM] != version:
+        return None
+    return EntitlementUser(token)
@@ -1,6 +1,11 @@
 from django.contrib import admin
 
-from apps.news.models import New
+from apps.news.models import (
+    New,
+    Notification,
+    NotificationDigest,
+    NotificationFanout,
+)
 
 
 @admin.register(New)
@@ -15,3 +20,48 @@ class NewAdmin(admin.ModelAdmin):
     ordering = ("-published_at",)
     list_per_page = 20
     raw_id_fields = ("author",)
+
+
+@admin.register(NotificationFanout)
+class NotificationFanoutAdmin(admin.ModelAdmin):
+    """
+    Progress of the news alerts fan-outs.
+    """
+
+    list_display = (
+        "news",
+        "done_chunks",
+        "total_chunks",
+        "failed_chunks",
+        "sent",
+        "created_at",
+        "finished_at",
+    )
+    ordering = ("-created_at",)
+    list_per_page = 20
+    raw_id_fields = ("news",)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    """
+    Outbox of the news alerts.
+    """
+
+    list_display = ("news", "user", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    ordering = ("-id",)
+    list_per_page = 20
+    raw_id_fields = ("news", "user")
+
+
+@admin.register(NotificationDigest)
+class NotificationDigestAdmin(admin.ModelAdmin):
+    """
+    Runs of the news digests.
+    """
+
+    list_display = ("frequency", "since", "until", "articles", "digests", "sent")
+    list_filter = ("frequency",)
+    ordering = ("-until",)
+    list_per_page = 20
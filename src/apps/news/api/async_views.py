@@ -0,0 +1,115 @@
+from django.http import HttpResponse
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework.request import Request
+from rest_framework.exceptions import NotFound, NotAuthenticated
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.news.models import New
+from setting.renderers import ORJSONRenderer
+from apps.account.models import User
+from apps.account.tokens import get_token_user
+from apps.news.api.views import NewViewSet
+from apps.news.api.filters import NewFilter
+from apps.news.api.pagination import NewCursorPagination
+from apps.news.api.serializes import NewSerializer, NewListSerializer
+
+
+async def aauthenticate(request):
+    """
+    Resolve the user of a request (JWT, then session) with the async ORM,
+    plan included, so entitlement checks never hit the database again.
+    In stateless JWT mode the token alone is enough.
+    """
+    users = User.objects.select_related("subscription_plan")
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            token = authenticator.get_validated_token(raw_token)
+            user_id = token[jwt_settings.USER_ID_CLAIM]
+        except (InvalidToken, TokenError, KeyError):
+            return None
+        user = await sync_to_async(get_token_user)(token)
+        if user is not None:
+            return user
+        lookup = {jwt_settings.USER_ID_FIELD: user_id}
+    else:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return None
+        lookup = {"pk": user.pk}
+    try:
+        return await users.aget(is_active=True, **lookup)
+    except User.DoesNotExist:
+        return None
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        ORJSONRenderer().render(data),
+        content_type=ORJSONRenderer.media_type,
+        status=status,
+    )
+
+
+def error_response(exception):
+    return json_response(
+        {"detail": exception.default_detail}, status=exception.status_code
+    )
+
+
+class NewAsyncListView(View):
+    """
+    ASGI-native news feed: same entitlement rules, filters, sparse fields
+    and keyset pagination as NewViewSet.list, on the async ORM.
+    """
+
+    ordering_fields = NewViewSet.ordering_fields
+
+    async def get(self, request):
+        user = await aauthenticate(request)
+        if user is None:
+            return error_response(NotAuthenticated)
+        # Wrapped only for query params, URLs and the serializer context
+        drf_request = Request(request)
+        context = {"request": drf_request, "view": self}
+
+        filterset = NewFilter(
+            drf_request.query_params,
+            queryset=New.objects.visible_to(user),
+            request=drf_request,
+        )
+        if not filterset.is_valid():
+            return json_response(filterset.errors, status=400)
+        fields = NewListSerializer(context=context).get_model_field_names()
+        queryset = filterset.qs.only(*fields)
+
+        paginator = NewCursorPagination()
+        page = await paginator.apaginate_queryset(queryset, drf_request, view=self)
+        data = NewListSerializer(page, many=True, context=context).data
+        return json_response({"next": paginator.get_next_link(), "results": data})
+
+
+class NewAsyncDetailView(View):
+    """
+    ASGI-native counterpart of NewViewSet.retrieve.
+    """
+
+    async def get(self, request, pk):
+        user = await aauthenticate(request)
+        if user is None:
+            return error_response(NotAuthenticated)
+        drf_request = Request(request)
+        context = {"request": drf_request, "view": self}
+
+        fields = NewSerializer(context=context).get_model_field_names()
+        try:
+            instance = await New.objects.visible_to(user).only(*fields).aget(pk=pk)
+        except New.DoesNotExist:
+            return error_response(NotFound)
+        data = NewSerializer(instance, context=context).data
+        return json_response(data)
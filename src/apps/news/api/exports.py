@@ -0,0 +1,51 @@
+import csv
+
+from setting.renderers import ORJSONRenderer
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "subtitle",
+    "excerpt",
+    "content",
+    "picture",
+    "author_id",
+    "author_name",
+    "status",
+    "is_exclusive",
+    "verticals",
+    "published_at",
+    "updated_at",
+]
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object that returns what is written, so csv.writer can feed a
+    streaming response one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def ndjson_rows(rows):
+    renderer = ORJSONRenderer()
+    for row in rows:
+        yield renderer.render(row) + b"\n"
+
+
+def csv_rows(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row["verticals"] = ",".join(row["verticals"])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+# format: (row encoder, content type)
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_rows, "application/x-ndjson"),
+    "csv": (csv_rows, "text/csv; charset=utf-8"),
+}
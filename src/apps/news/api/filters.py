@@ -1,6 +1,9 @@
 import django_filters.rest_framework as filters
+from django.db.models import F
+from django.contrib.postgres.search import SearchRank, SearchQuery
 
-from apps.news.models import New
+from apps.news.models import SEARCH_CONFIG, New
+from apps.account.fields import get_vertical_mask
 
 
 class CharArrayFilter(filters.BaseInFilter, filters.CharFilter):
@@ -12,10 +15,12 @@ class NewFilter(filters.FilterSet):
     Filter for News model.
     """
 
+    q = filters.CharFilter(method="filter_search")
     author = filters.CharFilter(field_name="author__name", lookup_expr="icontains")
     published_at = filters.DateFromToRangeFilter(field_name="published_at")
-    verticals = CharArrayFilter(field_name="verticals", lookup_expr="overlap")
+    verticals = CharArrayFilter(method="filter_verticals")
 
+    # Substring fallbacks, prefer ``q`` which uses the full-text index
     title = filters.CharFilter(field_name="title", lookup_expr="icontains")
     subtitle = filters.CharFilter(field_name="subtitle", lookup_expr="icontains")
     content = filters.CharFilter(field_name="content", lookup_expr="icontains")
@@ -23,6 +28,7 @@ class NewFilter(filters.FilterSet):
     class Meta:
         model = New
         fields = [
+            "q",
             "author",
             "published_at",
             "verticals",
@@ -30,3 +36,20 @@ class NewFilter(filters.FilterSet):
             "subtitle",
             "content",
         ]
+
+    def filter_search(self, queryset, name, value):
+        """
+        Full-text search over title, subtitle and content, best ranked first.
+        """
+        query = SearchQuery(value, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-published_at")
+        )
+
+    def filter_verticals(self, queryset, name, value):
+        """
+        News of any of the verticals, matched on the bitmask.
+        """
+        return queryset.filter(vertical_mask__overlap=get_vertical_mask(value))
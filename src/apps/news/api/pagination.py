@@ -0,0 +1,139 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.db.models import F, Q
+from django.core.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class NewCursorPagination(BasePagination):
+    """
+    Keyset pagination over ``(<ordering field>, id)``.
+
+    Pages are fetched with a ``WHERE field <= value AND (field, id) <
+    (value, pk)`` predicate instead of ``OFFSET``, the index seeks to the
+    cursor, and no ``COUNT(*)`` is issued, so deep pages cost the same as
+    the first one. Null values (e.g. drafts without
+    ``published_at``) sort as PostgreSQL does by default, first when
+    descending, so the same ``(field, id)`` index serves both directions.
+    The cursor is opaque and only moves forward, as a feed is read.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    default_ordering = "-published_at"
+    invalid_cursor_message = "Cursor inválido"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field = self.get_ordering_field(request, queryset, view)
+        self.descending = self.field.startswith("-")
+        self.field_name = self.field.lstrip("-")
+
+        queryset = queryset.order_by(*self.get_order_by())
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(*cursor))
+        # One extra row tells whether there is a next page
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering_field(self, request, queryset, view):
+        ordering = OrderingFilter().get_ordering(request, queryset, view)
+        if not ordering:
+            return self.default_ordering
+        return ordering[0]
+
+    def get_order_by(self):
+        if self.descending:
+            return [F(self.field_name).desc(), "-id"]
+        return [F(self.field_name).asc(), "id"]
+
+    def get_keyset_filter(self, value, pk):
+        after = "lt" if self.descending else "gt"
+        isnull = f"{self.field_name}__isnull"
+        if value is None:
+            # Nulls lead descending pages and trail ascending ones
+            keyset = Q(**{isnull: True, f"id__{after}": pk})
+            if self.descending:
+                keyset |= Q(**{isnull: False})
+            return keyset
+        # The redundant range is the index condition the scan seeks with,
+        # the OR alone would only filter rows
+        keyset = Q(**{f"{self.field_name}__{after}e": value}) & (
+            Q(**{f"{self.field_name}__{after}": value})
+            | Q(**{self.field_name: value, f"id__{after}": pk})
+        )
+        if not self.descending:
+            keyset |= Q(**{isnull: True})
+        return keyset
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        value = getattr(last, self.field_name)
+        payload = {
+            "o": self.field,
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "id": str(last.pk),
+        }
+        cursor = b64encode(json.dumps(payload).encode(), altchars=b"-_").decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode(), altchars=b"-_"))
+            if payload["o"] != self.field:
+                raise ValueError("Cursor of another ordering")
+            field = model._meta.get_field(self.field_name)
+            value = None if payload["v"] is None else field.to_python(payload["v"])
+            pk = model._meta.pk.to_python(payload["id"])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor opaco da próxima página.",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -1,20 +1,92 @@
+import uuid
+
 from rest_framework import serializers
+from django.core.exceptions import FieldDoesNotExist
 
 from apps.news.models import New
 from apps.account.models import User
 
 
-class NewSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Restrict the fields of a GET response with the comma separated
+    ``?fields=`` (keep only these) and ``?omit=`` (drop these) parameters.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        params = request.query_params
+        only = self.parse_field_names(params.get(self.fields_query_param))
+        omit = self.parse_field_names(params.get(self.omit_query_param))
+        for name in list(self.fields):
+            if (only and name not in only) or name in omit:
+                self.fields.pop(name)
+
+    @staticmethod
+    def parse_field_names(value):
+        if not value:
+            return set()
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    def get_model_field_names(self):
+        """
+        Return the model fields backing the remaining serializer fields, to
+        restrict the SELECT with ``.only()``.
+        """
+        opts = self.Meta.model._meta
+        names = {opts.pk.name}
+        for field in self.fields.values():
+            try:
+                names.add(opts.get_field(field.source).name)
+            except FieldDoesNotExist:
+                continue
+        return names
+
+
+class PictureDerivativesField(serializers.ReadOnlyField):
+    """
+    URLs and dimensions of the resized versions of the picture.
+    """
+
+    def to_representation(self, value):
+        storage = New._meta.get_field("picture").storage
+        request = self.context.get("request")
+        derivatives = []
+        for derivative in value or []:
+            url = storage.url(derivative["name"])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            derivatives.append(
+                {
+                    "url": url,
+                    "width": derivative["width"],
+                    "height": derivative["height"],
+                    "format": derivative["format"],
+                }
+            )
+        return derivatives
+
+
+class NewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the New model.
     """
 
-    author = serializers.StringRelatedField(read_only=True)
+    # Read from the columns of the news row, without loading the author
+    author = serializers.CharField(source="author_id", read_only=True)
+    author_name = serializers.CharField(read_only=True)
+    picture_derivatives = PictureDerivativesField()
 
     class Meta:
         model = New
-        fields = "__all__"
-        read_only_fields = ["author"]
+        exclude = ["search_vector", "vertical_mask", "notify"]
+        read_only_fields = ["author", "author_name"]
 
     def validate(self, attrs):
         user = self.context["request"].user
@@ -26,7 +98,7 @@ class NewSerializer(serializers.ModelSerializer):
             )
 
         # For updates, check if user is the author
-        if self.instance and self.instance.author != user:
+        if self.instance and self.instance.author_id != user.pk:
             raise serializers.ValidationError(
                 "Você não tem permissão para editar essa notícia"
             )
@@ -38,9 +110,138 @@ class NewSerializer(serializers.ModelSerializer):
         validated_data["author"] = user
         return super().create(validated_data)
 
-    def to_representation(self, instance):
-        ret = super().to_representation(instance)
-        # Ensure author is returned as string (ID) for consistency
-        if instance.author:
-            ret["author"] = str(instance.author.id)
-        return ret
+
+class NewListSerializer(NewSerializer):
+    """
+    Feed representation of the New model, without the content body.
+    """
+
+    class Meta(NewSerializer.Meta):
+        exclude = None
+        fields = [
+            "id",
+            "title",
+            "subtitle",
+            "excerpt",
+            "picture",
+            "picture_derivatives",
+            "published_at",
+            "updated_at",
+            "author",
+            "author_name",
+            "status",
+            "is_exclusive",
+            "verticals",
+        ]
+
+
+class StoredImageField(serializers.ImageField):
+    """
+    Image field that also accepts the name of a file already in storage,
+    for JSON payloads that cannot carry uploads.
+    """
+
+    default_error_messages = {
+        "not_stored": "Arquivo não encontrado no armazenamento",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            if not New._meta.get_field("picture").storage.exists(data):
+                self.fail("not_stored")
+            return data
+        return super().to_internal_value(data)
+
+
+class NewBulkListSerializer(serializers.ListSerializer):
+    """
+    Create or update a list of news in one transaction.
+
+    Updates take the ``id`` of each item and the current instances as a
+    queryset. With ``partial_success`` in the context, invalid items are
+    reported in ``item_errors`` and the valid ones are still saved.
+    """
+
+    MAX_ITEMS = 1000
+
+    def __init__(self, *args, **kwargs):
+        # ListSerializer only takes max_length as a keyword argument
+        kwargs.setdefault("max_length", self.MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+        self.instance_map = {}
+        if self.instance is not None:
+            self.instance_map = {str(new.pk): new for new in self.instance}
+        self.item_errors = []
+        self.validated_instances = []
+
+    @staticmethod
+    def get_ids(data):
+        """
+        Return the valid ids of a list payload, to load the instances.
+        """
+        ids = []
+        for item in data if isinstance(data, list) else []:
+            try:
+                ids.append(uuid.UUID(str(item.get("id"))))
+            except (AttributeError, ValueError):
+                continue
+        return ids
+
+    def run_child_validation(self, data):
+        instance = None
+        try:
+            if self.instance is not None:
+                instance = self.get_child_instance(data)
+            self.child.instance = instance
+            self.child.initial_data = data
+            validated = super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            if not self.context.get("partial_success"):
+                raise
+            self.item_errors.append(exc.detail)
+            return None
+        self.item_errors.append({})
+        self.validated_instances.append(instance)
+        return validated
+
+    def get_child_instance(self, data):
+        item_id = data.get("id") if isinstance(data, dict) else None
+        instance = self.instance_map.get(str(item_id))
+        if instance is None:
+            raise serializers.ValidationError({"id": "Notícia não encontrada"})
+        return instance
+
+    def to_internal_value(self, data):
+        self.item_errors = []
+        self.validated_instances = []
+        validated = super().to_internal_value(data)
+        return [attrs for attrs in validated if attrs is not None]
+
+    def create(self, validated_data):
+        author = self.context["request"].user
+        news = [New(author=author, **attrs) for attrs in validated_data]
+        return New.objects.bulk_save(news)
+
+    def update(self, instance, validated_data):
+        # Authorship was checked item by item, reuse the request user
+        author = self.context["request"].user
+        fields = set()
+        news = []
+        for new, attrs in zip(self.validated_instances, validated_data):
+            new.author = author
+            for name, value in attrs.items():
+                setattr(new, name, value)
+            fields.update(attrs)
+            news.append(new)
+        return New.objects.bulk_save(news, fields=fields)
+
+
+class NewBulkSerializer(NewSerializer):
+    """
+    Item of the bulk create/update payloads.
+    """
+
+    picture = StoredImageField()
+
+    class Meta(NewSerializer.Meta):
+        list_serializer_class = NewBulkListSerializer
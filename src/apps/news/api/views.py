@@ -1,9 +1,38 @@
-from rest_framework import viewsets
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from django.utils.http import http_date
+from django.utils.cache import patch_vary_headers, get_conditional_response
+from django.core.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as APIValidationError
+from rest_framework.exceptions import PermissionDenied
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from apps.news import cache as feed_cache
 from apps.news.models import New
 from apps.account.models import User
+from apps.news.api.exports import EXPORT_FIELDS, EXPORT_FORMATS, EXPORT_CHUNK_SIZE
 from apps.news.api.filters import NewFilter
-from apps.news.api.serializes import NewSerializer
+from apps.news.api.pagination import NewCursorPagination
+from apps.news.api.serializes import (
+    NewSerializer,
+    NewBulkSerializer,
+    NewListSerializer,
+    NewBulkListSerializer,
+)
+from apps.account.authentication import EntitlementJWTAuthentication
+
+
+def vary_on_accept(response):
+    """
+    The validators are shared by every renderer (JSON, browsable API), so
+    caches must key the responses on the negotiated representation.
+    """
+    patch_vary_headers(response, ("Accept",))
+    return response
 
 
 class NewViewSet(viewsets.ModelViewSet):
@@ -11,22 +40,235 @@ class NewViewSet(viewsets.ModelViewSet):
     A viewset for viewing and editing New instances.
     """
 
+    # Reads may be authenticated from the entitlement claims of the token
+    # alone (ACCOUNT_STATELESS_JWT), the other views keep loading the user
+    authentication_classes = [
+        EntitlementJWTAuthentication if auth is JWTAuthentication else auth
+        for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ]
     queryset = New.objects.all()
     serializer_class = NewSerializer
     filterset_class = NewFilter
     ordering_fields = ["published_at", "title"]
+    # File fields of cached payloads, stored relative to the host
+    url_fields = ["picture"]
+
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client asks for it with
+        ``?pagination=cursor`` (or follows a cursor link).
+        """
+        if not hasattr(self, "_paginator"):
+            params = getattr(self.request, "query_params", {})
+            if (
+                params.get("pagination") == "cursor"
+                or NewCursorPagination.cursor_query_param in params
+            ):
+                self._paginator = NewCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return NewListSerializer
+        return super().get_serializer_class()
+
+    def get_select_fields(self):
+        fields = self.get_serializer().get_model_field_names()
+        if self.action == "retrieve":
+            fields.add("updated_at")  # ETag / Last-Modified
+        return fields
 
     def get_queryset(self):
         user: User = self.request.user
-        news = New.objects.all()
-        if user.user_type == User.WRITER:
-            return news
+        news = New.objects.visible_to(user)
+        if self.action in ("list", "retrieve"):
+            # Only select the columns the response renders (e.g. feeds and
+            # ?fields= never load content)
+            news = news.only(*self.get_select_fields())
+        return news
+
+    def list(self, request, *args, **kwargs):
+        key = feed_cache.get_feed_key(request)
+        etag = feed_cache.get_feed_etag(key)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return vary_on_accept(not_modified)
+
+        # Pages are shared by every user with the same entitlement
+        data = feed_cache.get_feed_page(key)
+        if data is not None:
+            response = Response(data)
         else:
-            news = news.filter(status=New.PUBLISHED)
+            response = super().list(request, *args, **kwargs)
+            feed_cache.set_feed_page(key, response.data)
+        response["ETag"] = etag
+        return vary_on_accept(response)
+
+    def retrieve(self, request, *args, **kwargs):
+        params = request.query_params
+        if (
+            NewSerializer.fields_query_param in params
+            or NewSerializer.omit_query_param in params
+        ):
+            instance = self.get_object()
+            return self.get_article_response(
+                request,
+                instance.pk,
+                instance.updated_at,
+                lambda: self.get_serializer(instance).data,
+            )
+
+        # Payload shared by every reader, entitlement checked per request
+        entry = feed_cache.get_article(
+            self.kwargs[self.lookup_field], self.build_article
+        )
+        if entry is None or not self.has_entitlement(entry["meta"]):
+            raise Http404
+        meta = entry["meta"]
+        return self.get_article_response(
+            request,
+            meta["pk"],
+            meta["updated_at"],
+            lambda: self.absolutize_urls(request, entry["data"]),
+        )
+
+    def get_article_response(self, request, pk, updated_at, get_data):
+        """
+        Answer 304 from the validators alone, before serializing.
+        """
+        etag = '"{}-{}"'.format(pk, updated_at.timestamp())
+        last_modified = int(updated_at.timestamp())
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return vary_on_accept(not_modified)
+
+        response = Response(get_data())
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return vary_on_accept(response)
+
+    def build_article(self):
+        try:
+            instance = New.objects.get(pk=self.kwargs[self.lookup_field])
+        except (New.DoesNotExist, ValidationError):
+            return None
+        # Serialized without the request so the payload is shareable
+        serializer = NewSerializer(instance, context={"view": self})
+        return {
+            "meta": {
+                "pk": instance.pk,
+                "status": instance.status,
+                "is_exclusive": instance.is_exclusive,
+                "verticals": list(instance.verticals),
+                "published_at": instance.published_at,
+                "updated_at": instance.updated_at,
+            },
+            "data": dict(serializer.data),
+        }
+
+    def has_entitlement(self, meta):
+        """
+        Same visibility rules as NewQuerySet.visible_to, on cached article
+        metadata.
+        """
+        user: User = self.request.user
+        if user.user_type == User.WRITER:
+            return True
+        if meta["status"] != New.PUBLISHED and not (
+            feed_cache.is_embargo_visibility()
+            and meta.get("published_at") is not None
+            and meta["published_at"] <= timezone.now()
+        ):
+            return False
         if not user.subscription_plan:
-            return news.filter(is_exclusive=False)
-        news = news.filter(
-            is_exclusive=True,
-            verticals__overlap=user.subscription_plan.verticals,
+            return not meta["is_exclusive"]
+        return meta["is_exclusive"] and bool(
+            set(meta["verticals"]) & set(user.subscription_plan.verticals)
+        )
+
+    def absolutize_urls(self, request, data):
+        data = dict(data)
+        for name in self.url_fields:
+            if data.get(name):
+                data[name] = request.build_absolute_uri(data[name])
+        if data.get("picture_derivatives"):
+            data["picture_derivatives"] = [
+                {**derivative, "url": request.build_absolute_uri(derivative["url"])}
+                for derivative in data["picture_derivatives"]
+            ]
+        return data
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        """
+        Stream the whole archive as NDJSON (default) or CSV
+        (``?export_format=csv``), honouring the NewFilter parameters.
+        """
+        if request.user.user_type != User.WRITER:
+            raise PermissionDenied("Você não tem permissão para exportar notícias")
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise APIValidationError(
+                {"export_format": f"Formatos suportados: {', '.join(EXPORT_FORMATS)}"}
+            )
+        encode, content_type = EXPORT_FORMATS[export_format]
+
+        # Server-side cursor, memory stays flat whatever the archive size
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values(*EXPORT_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        response = StreamingHttpResponse(encode(rows), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="news.{export_format}"'
+        return response
+
+    @action(detail=False, methods=["post", "patch"])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Create (POST) or update (PATCH, items with ``id``) a list of news
+        in one transaction.
+
+        Any invalid item rejects the whole batch, unless
+        ``?partial_success=true`` is given: the valid items are saved and
+        the errors of the others are reported by index.
+        """
+        if request.user.user_type != User.WRITER:
+            raise PermissionDenied("Você não tem permissão para criar/editar notícias")
+        partial_success = request.query_params.get("partial_success") in (
+            "1",
+            "true",
+        )
+        instances = None
+        if request.method == "PATCH":
+            ids = NewBulkListSerializer.get_ids(request.data)
+            instances = New.objects.filter(pk__in=ids)
+        serializer = NewBulkSerializer(
+            instances,
+            data=request.data,
+            many=True,
+            partial=instances is not None,
+            context={
+                **self.get_serializer_context(),
+                "partial_success": partial_success,
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        errors = [
+            {"index": index, "errors": item_errors}
+            for index, item_errors in enumerate(serializer.item_errors)
+            if item_errors
+        ]
+        return Response(
+            {"results": serializer.data, "errors": errors},
+            status=(
+                status.HTTP_200_OK if instances is not None else status.HTTP_201_CREATED
+            ),
         )
-        return news
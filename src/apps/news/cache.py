@@ -0,0 +1,327 @@
+import math
+import time
+import random
+import hashlib
+
+from django.db import transaction
+from django.conf import settings
+from django.utils import timezone
+from django.core.cache import cache
+
+from apps.account.models import User
+
+FEED_KEY_PREFIX = "news:feed"
+FEED_VERSION_PREFIX = "news:feed:version"
+
+# Entitlement scopes. Every cached feed page depends on the versions of the
+# scopes of the user that requested it, and every article change bumps the
+# versions of the scopes that can see the article.
+ALL_SCOPE = "all"
+WRITER_SCOPE = "writer"
+PUBLIC_SCOPE = "public"
+VERTICAL_SCOPE = "vertical:{}"
+
+
+# Timestamp of the next scheduled publication, for embargo visibility
+NEXT_EMBARGO_KEY = "news:embargo:next"
+
+ARTICLE_KEY = "news:article:{}"
+ARTICLE_VERSION_KEY = "news:article:version:{}"
+ARTICLE_LOCK_KEY = "news:article:lock:{}"
+ARTICLE_LOCK_TIMEOUT = 10
+ARTICLE_LOCK_WAIT = 2
+ARTICLE_LOCK_POLL = 0.05
+# XFetch factor, > 1 favours earlier refreshes
+ARTICLE_EARLY_EXPIRY_BETA = 1.0
+
+
+def get_feed_timeout():
+    return getattr(settings, "NEWS_FEED_CACHE_TIMEOUT", 60)
+
+
+def get_article_timeout():
+    return getattr(settings, "NEWS_ARTICLE_CACHE_TIMEOUT", 300)
+
+
+def is_embargo_visibility():
+    """
+    Whether scheduled drafts become visible as soon as their
+    ``published_at`` passes, instead of when publish_due_news runs.
+    """
+    return getattr(settings, "NEWS_EMBARGO_VISIBILITY", False)
+
+
+def get_next_embargo():
+    """
+    Return the timestamp of the next scheduled ``published_at``, or ``None``.
+
+    Cached until that moment (at most a feed timeout), and dropped whenever
+    an article changes.
+    """
+    now = time.time()
+    value = cache.get(NEXT_EMBARGO_KEY)
+    if value is None or 0 < value <= now:
+        from apps.news.models import New
+
+        published_at = (
+            New.objects.filter(status=New.DRAFT, published_at__gt=timezone.now())
+            .order_by("published_at")
+            .values_list("published_at", flat=True)
+            .first()
+        )
+        value = published_at.timestamp() if published_at else 0
+        timeout = get_feed_timeout()
+        if value:
+            timeout = min(timeout, math.ceil(value - now))
+        cache.set(NEXT_EMBARGO_KEY, value, timeout=max(timeout, 1))
+    return value or None
+
+
+def get_feed_page_timeout():
+    """
+    Feed timeout, shortened in embargo visibility mode so no page outlives
+    the next scheduled publication.
+    """
+    timeout = get_feed_timeout()
+    if is_embargo_visibility():
+        next_embargo = get_next_embargo()
+        if next_embargo:
+            timeout = min(timeout, math.ceil(next_embargo - time.time()))
+    return max(timeout, 1)
+
+
+def get_user_scopes(user: User):
+    """
+    Return the normalized entitlement of a user as a tuple of scopes.
+
+    Readers sharing the same plan verticals share the same scopes and
+    therefore the same cached pages.
+    """
+    if user.user_type == User.WRITER:
+        return (WRITER_SCOPE,)
+    if not user.subscription_plan:
+        return (PUBLIC_SCOPE,)
+    verticals = sorted(set(user.subscription_plan.verticals))
+    return tuple(VERTICAL_SCOPE.format(vertical) for vertical in verticals)
+
+
+def get_article_scopes(values):
+    """
+    Return the scopes that can see an article, given its field values.
+
+    Returns ``None`` when the values are incomplete (e.g. deferred fields),
+    meaning the article may belong to any scope.
+    """
+    try:
+        status = values["status"]
+        is_exclusive = values["is_exclusive"]
+        verticals = values["verticals"]
+    except KeyError:
+        return None
+    from apps.news.models import New
+
+    scopes = {WRITER_SCOPE}
+    if status != New.PUBLISHED:
+        if not is_embargo_visibility():
+            return scopes
+        # A scheduled draft is, or will be, visible without being saved
+        try:
+            if values["published_at"] is None:
+                return scopes
+        except KeyError:
+            return None
+    if not is_exclusive:
+        scopes.add(PUBLIC_SCOPE)
+        return scopes
+    scopes.update(VERTICAL_SCOPE.format(vertical) for vertical in verticals or [])
+    return scopes
+
+
+def get_versions(keys):
+    """
+    Return the current version of each version key.
+
+    Missing versions start from the clock, so a version lost to eviction
+    never reuses a value (and an ETag) handed out before.
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+def bump_versions(keys):
+    for key in keys:
+        cache.add(key, time.time_ns(), timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr, a fresh version is as good
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_scopes(scopes):
+    bump_versions(f"{FEED_VERSION_PREFIX}:{scope}" for scope in scopes)
+
+
+def invalidate_article(new):
+    """
+    Invalidate the cached payload of ``new`` and the cached feed pages of
+    every entitlement that could see it before or after its last change.
+    """
+    invalidate_articles([new])
+
+
+def invalidate_articles(news):
+    """
+    Batch version of invalidate_article, each scope is bumped once.
+
+    The scopes are computed now, from the values being saved, but bumped
+    once the transaction commits: bumped earlier, a reader could rebuild
+    an entry from the old row and store it under the new version.
+    """
+    article_keys = [ARTICLE_VERSION_KEY.format(new.pk) for new in news]
+    scopes = set()
+    for new in news:
+        current = {
+            "status": new.status,
+            "is_exclusive": new.is_exclusive,
+            "verticals": new.verticals,
+        }
+        previous = getattr(new, "_loaded_values", None)
+        new_scopes = get_article_scopes(current)
+        if previous is not None:
+            previous_scopes = get_article_scopes(previous)
+            if previous_scopes is None:
+                scopes = None
+                break
+            new_scopes |= previous_scopes
+        scopes |= new_scopes
+    scopes = scopes if scopes is not None else [ALL_SCOPE]
+
+    def bump():
+        bump_versions(article_keys)
+        bump_scopes(scopes)
+        # The article may have been (re)scheduled
+        cache.delete(NEXT_EMBARGO_KEY)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_article_ids(pks):
+    """
+    Invalidate the cached payloads of the articles ``pks`` and every cached
+    feed page, for queryset updates that never load the articles.
+    """
+    article_keys = [ARTICLE_VERSION_KEY.format(pk) for pk in pks]
+
+    def bump():
+        bump_versions(article_keys)
+        bump_scopes([ALL_SCOPE])
+
+    transaction.on_commit(bump)
+
+
+def get_feed_key(request):
+    """
+    Build the cache key of a feed page from the user entitlement, the
+    current scope versions and the query parameters.
+    """
+    scopes = (ALL_SCOPE,) + get_user_scopes(request.user)
+    # Pages change when a scheduled article goes live, without any save
+    embargo = get_next_embargo() if is_embargo_visibility() else None
+    version_keys = [f"{FEED_VERSION_PREFIX}:{scope}" for scope in scopes]
+    versions = get_versions(version_keys)
+    params = sorted(
+        (key, tuple(values)) for key, values in request.query_params.lists()
+    )
+    raw = repr(
+        (
+            request.get_host(),
+            [(scope, versions.get(key, 0)) for scope, key in zip(scopes, version_keys)],
+            embargo,
+            params,
+        )
+    )
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"{FEED_KEY_PREFIX}:{digest}"
+
+
+def get_feed_etag(key):
+    """
+    Strong ETag of a feed page: the page only changes when the versions of
+    its entitlement scopes (part of the key) change.
+    """
+    return '"{}"'.format(key.rsplit(":", 1)[-1])
+
+
+def get_feed_page(key):
+    return cache.get(key)
+
+
+def set_feed_page(key, data):
+    cache.set(key, data, timeout=get_feed_page_timeout())
+
+
+def should_refresh_early(entry):
+    """
+    Probabilistic early expiration (XFetch): the closer the entry is to its
+    expiry and the longer it took to build, the likelier a reader refreshes
+    it before it expires for everyone at once.
+    """
+    jitter = -entry["delta"] * ARTICLE_EARLY_EXPIRY_BETA * math.log(1 - random.random())
+    return time.time() + jitter >= entry["expiry"]
+
+
+def get_article(pk, build):
+    """
+    Read-through cache of a single article.
+
+    ``build`` loads the article and returns ``{"meta": ..., "data": ...}``,
+    or ``None`` if it does not exist. Only one worker at a time rebuilds an
+    entry, the others keep serving the previous one or wait for it.
+    """
+    key = ARTICLE_KEY.format(pk)
+    version_key = ARTICLE_VERSION_KEY.format(pk)
+    values = cache.get_many([key, version_key])
+    # The version is read before the database so a save racing with the
+    # rebuild leaves an entry that is already outdated
+    version = values.get(version_key) or get_versions([version_key])[version_key]
+    entry = values.get(key)
+    if entry is not None and entry["version"] != version:
+        entry = None
+    if entry is not None and not should_refresh_early(entry):
+        return entry
+
+    lock_key = ARTICLE_LOCK_KEY.format(pk)
+    if not cache.add(lock_key, 1, timeout=ARTICLE_LOCK_TIMEOUT):
+        if entry is not None:
+            return entry
+        deadline = time.monotonic() + ARTICLE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(ARTICLE_LOCK_POLL)
+            entry = cache.get(key)
+            if entry is not None and entry["version"] == version:
+                return entry
+        # The rebuilding worker is too slow or died, build it ourselves
+        return build_article(key, version, build)
+    try:
+        return build_article(key, version, build)
+    finally:
+        cache.delete(lock_key)
+
+
+def build_article(key, version, build):
+    start = time.monotonic()
+    entry = build()
+    if entry is None:
+        return None
+    timeout = get_article_timeout()
+    entry["version"] = version
+    entry["delta"] = time.monotonic() - start
+    entry["expiry"] = time.time() + timeout
+    cache.set(key, entry, timeout=timeout)
+    return entry
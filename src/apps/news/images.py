@@ -0,0 +1,119 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ExifTags, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+DERIVATIVES_DIR = "news_pictures/derivatives"
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+# Pillow format: save options. Formats Pillow cannot write (e.g. AVIF
+# without libavif) are skipped.
+DERIVATIVE_FORMATS = {
+    "WEBP": {"quality": 80, "method": 4},
+    "AVIF": {"quality": 60, "speed": 6},
+}
+# EXIF orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+_pool = None
+
+
+def get_pool():
+    """
+    Return the shared process pool, or None to resize in process.
+    """
+    global _pool
+    workers = getattr(settings, "NEWS_IMAGE_WORKERS", None)
+    if workers == 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def get_formats():
+    Image.init()
+    return [name for name in DERIVATIVE_FORMATS if name in Image.SAVE]
+
+
+def get_target_widths(width):
+    """
+    Widths to render for an original ``width``, never upscaling.
+    """
+    widths = [target for target in DERIVATIVE_WIDTHS if target < width]
+    widths.append(min(width, DERIVATIVE_WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def get_size(data):
+    """
+    Displayed size of an image, reading only its header.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ExifTags.Base.Orientation)
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def render(data, width, formats):
+    """
+    Resize an image to ``width`` and encode it in each of ``formats``.
+
+    Runs in the pool processes, so it only takes and returns picklable
+    values: ``[(format, content, width, height), ...]``.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        # Let JPEG decode at a reduced scale when much larger than needed
+        image.draft("RGB", (width, width))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize(
+            (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+        )
+        renders = []
+        for name in formats:
+            buffer = io.BytesIO()
+            image.save(buffer, format=name, **DERIVATIVE_FORMATS[name])
+            renders.append((name, buffer.getvalue(), width, height))
+        return renders
+
+
+def generate_derivatives(picture):
+    """
+    Render and store the derivatives of a picture field file.
+
+    Returns the ``picture_derivatives`` value of New.
+    """
+    with picture.open("rb") as file:
+        data = file.read()
+    width, _ = get_size(data)
+    widths = get_target_widths(width)
+    formats = get_formats()
+
+    pool = get_pool()
+    jobs = [(data, target, formats) for target in widths]
+    if pool is None:
+        results = [render(*job) for job in jobs]
+    else:
+        results = pool.map(render, *zip(*jobs))
+
+    stem = os.path.splitext(os.path.basename(picture.name))[0]
+    derivatives = []
+    for renders in results:
+        for name, content, target_width, target_height in renders:
+            path = f"{DERIVATIVES_DIR}/{stem}-{target_width}w.{name.lower()}"
+            derivatives.append(
+                {
+                    "name": picture.storage.save(path, ContentFile(content)),
+                    "width": target_width,
+                    "height": target_height,
+                    "format": name.lower(),
+                }
+            )
+    return derivatives
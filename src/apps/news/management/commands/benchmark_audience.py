@@ -0,0 +1,112 @@
+import time
+import random
+import itertools
+import statistics
+
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.news.models import Audience
+from apps.account.models import User, SubscriptionPlan
+
+VERTICALS = [vertical for vertical, _ in SubscriptionPlan.VERTICAL_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare resolving the readers of exclusive news through the plan join "
+        "(verticals overlap) and through the audience index, over synthetic "
+        "readers created and rolled back in one transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=1_000_000)
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark needs PostgreSQL")
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        rnd = random.Random(options["seed"])
+        # One exclusive plan per combination of verticals, plus a free plan
+        plans = [
+            SubscriptionPlan(
+                name=f"Benchmark {'+'.join(verticals)}",
+                price=0,
+                is_exclusive=True,
+                verticals=list(verticals),
+            )
+            for size in range(1, len(VERTICALS) + 1)
+            for verticals in itertools.combinations(VERTICALS, size)
+        ]
+        plans.append(SubscriptionPlan(name="Benchmark free", price=0))
+        SubscriptionPlan.objects.bulk_create(plans)
+        # A quarter of the readers without plan
+        plan_ids = [str(plan.pk) for plan in plans] + [None] * (len(plans) // 3)
+
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {User._meta.db_table} (password, is_superuser, "
+                "username, first_name, last_name, email, is_staff, is_active, "
+                "date_joined, user_type, notification_frequency, "
+                "subscription_plan_id) "
+                "SELECT '', false, 'benchmark_' || i, '', '', "
+                "'benchmark_' || i || '@example.com', false, true, now(), "
+                "%s, %s, (%s::uuid[])[1 + i %% %s] "
+                "FROM generate_series(1, %s) AS i",
+                [
+                    User.READER,
+                    User.IMMEDIATE,
+                    plan_ids,
+                    len(plan_ids),
+                    options["readers"],
+                ],
+            )
+        self.report("Created readers", start)
+
+        start = time.perf_counter()
+        rows = Audience.objects.rebuild(
+            User.objects.filter(username__startswith="benchmark_")
+        )
+        self.report(f"Built the audience index ({rows} rows)", start)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+            cursor.execute(f"ANALYZE {Audience._meta.db_table}")
+
+        readers = User.objects.filter(
+            user_type=User.READER, notification_frequency=User.IMMEDIATE
+        )
+        timings = {"plan join": [], "audience index": []}
+        for _ in range(options["runs"]):
+            verticals = rnd.sample(VERTICALS, rnd.randint(1, 2))
+            queries = {
+                "plan join": readers.filter(
+                    subscription_plan__verticals__overlap=verticals,
+                    subscription_plan__is_exclusive=True,
+                ),
+                "audience index": readers.filter(
+                    id__in=Audience.objects.recipients(verticals)
+                ),
+            }
+            counts = set()
+            for label, queryset in queries.items():
+                start = time.perf_counter()
+                counts.add(len(queryset.values_list("id", flat=True)))
+                timings[label].append(time.perf_counter() - start)
+            if len(counts) != 1:
+                raise CommandError(f"Recipients differ for {verticals}: {counts}")
+
+        for label, seconds in timings.items():
+            self.stdout.write(
+                f"{label}: median {statistics.median(seconds) * 1000:.1f} ms, "
+                f"max {max(seconds) * 1000:.1f} ms over {options['runs']} runs"
+            )
+
+    def report(self, label, start):
+        self.stdout.write(f"{label} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,152 @@
+import time
+import asyncio
+import threading
+from functools import partial
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+
+from apps.news.tasks import send_emails
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+PIPELINING_BACKEND = "setting.mail.PipeliningEmailBackend"
+
+
+class SMTPSinkProtocol(asyncio.Protocol):
+    def __init__(self, sink):
+        self.sink = sink
+        self.buffer = b""
+        self.in_data = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.sink.connections += 1
+        transport.write(b"220 sink ESMTP\r\n")
+
+    def data_received(self, data):
+        # Every client write reaches the server one round trip later
+        loop = asyncio.get_running_loop()
+        loop.call_later(self.sink.latency, self.process, data)
+
+    def process(self, data):
+        self.buffer += data
+        while b"\r\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\r\n", 1)
+            if self.in_data:
+                if line == b".":
+                    self.in_data = False
+                    self.sink.received += 1
+                    self.transport.write(b"250 OK\r\n")
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.transport.write(b"250-sink\r\n250 PIPELINING\r\n")
+            elif command == b"DATA":
+                self.in_data = True
+                self.transport.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command == b"QUIT":
+                self.transport.write(b"221 Bye\r\n")
+                self.transport.close()
+            else:
+                self.transport.write(b"250 OK\r\n")
+
+
+class SMTPSink:
+    """
+    Minimal in-process SMTP server that accepts and discards every message.
+    Each client write is processed ``latency`` seconds after it arrives, to
+    model the round trip to a real relay.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.received = 0
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            self.loop.create_server(lambda: SMTPSinkProtocol(self), "127.0.0.1", 0)
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare one SMTP connection per alert with send_emails (one "
+        "connection per chunk, with and without PIPELINING) against an "
+        "in-process SMTP sink."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=1.0,
+            help="Round trip to the sink, in milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(latency=options["latency"] / 1000)
+        total = options["messages"]
+        recipients = [f"reader_{i}@example.com" for i in range(total)]
+        batch_size = options["batch_size"]
+        try:
+            runs = [
+                (
+                    "one connection per alert",
+                    lambda: self.send_one_by_one(sink, recipients),
+                ),
+            ]
+            for backend in (SMTP_BACKEND, PIPELINING_BACKEND):
+                runs.append(
+                    (
+                        f"send_emails, batches of {batch_size}, "
+                        f"{backend.rsplit('.', 1)[-1]}",
+                        partial(
+                            send_emails,
+                            "Notificação de nova notícia",
+                            "Confira a nova notícia",
+                            recipients,
+                            batch_size=batch_size,
+                            connection=self.get_connection(sink, backend),
+                        ),
+                    )
+                )
+            for label, run in runs:
+                sink.received = sink.connections = 0
+                start = time.perf_counter()
+                run()
+                seconds = time.perf_counter() - start
+                self.stdout.write(
+                    f"{label}: {sink.received / seconds:.0f} messages/s "
+                    f"({sink.received} messages, {sink.connections} connections, "
+                    f"{seconds:.2f}s)"
+                )
+        finally:
+            sink.stop()
+
+    def get_connection(self, sink, backend=SMTP_BACKEND):
+        return get_connection(
+            backend,
+            host="127.0.0.1",
+            port=sink.port,
+            username="",
+            password="",
+            use_tls=False,
+            use_ssl=False,
+        )
+
+    def send_one_by_one(self, sink, recipients):
+        for email in recipients:
+            EmailMessage(
+                "Notificação de nova notícia",
+                "Confira a nova notícia",
+                to=[email],
+                connection=self.get_connection(sink),
+            ).send()
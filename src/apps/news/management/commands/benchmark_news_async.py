@@ -0,0 +1,87 @@
+import time
+import asyncio
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.test import Client, AsyncClient
+from django.urls import reverse
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.account.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the async news endpoints with NewViewSet (WSGI and ASGI) "
+        "under concurrent load, against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True, help="User to read as")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Let NewViewSet serve feed pages from cache (busted by default)",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options["username"])
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        self.bust_cache = not options["with_cache"]
+        total, concurrency = options["requests"], options["concurrency"]
+
+        list_url = reverse("news-list") + "?pagination=cursor"
+        async_url = reverse("news-async-list") + "?pagination=cursor"
+        runs = [
+            ("NewViewSet under WSGI (threads)", self.run_wsgi, list_url),
+            ("NewViewSet under ASGI", self.run_asgi, list_url),
+            ("Async view under ASGI", self.run_asgi, async_url),
+        ]
+        for label, run, url in runs:
+            elapsed, latencies = run(url, total, concurrency)
+            latencies.sort()
+            self.stdout.write(
+                f"{label}: {total / elapsed:.0f} req/s, "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms"
+            )
+
+    def get_url(self, url, i):
+        # A distinct parameter per request defeats the feed cache
+        return f"{url}&_={i}" if self.bust_cache else url
+
+    def run_wsgi(self, url, total, concurrency):
+        def fetch(i):
+            start = time.perf_counter()
+            response = Client().get(self.get_url(url, i), headers=self.headers)
+            assert response.status_code == 200, response.content
+            connections.close_all()
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(fetch, range(total)))
+        return time.perf_counter() - start, latencies
+
+    def run_asgi(self, url, total, concurrency):
+        async def fetch(client, semaphore, i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(self.get_url(url, i), headers=self.headers)
+                assert response.status_code == 200, response.content
+                return time.perf_counter() - start
+
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(
+                *(fetch(client, semaphore, i) for i in range(total))
+            )
+
+        start = time.perf_counter()
+        latencies = asyncio.run(run())
+        return time.perf_counter() - start, list(latencies)
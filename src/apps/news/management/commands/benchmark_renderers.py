@@ -0,0 +1,79 @@
+import gzip
+import uuid
+import timeit
+from decimal import Decimal
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from django.core.management.base import BaseCommand
+
+from apps.news.models import New
+from setting.renderers import ORJSONRenderer
+from apps.account.models import SubscriptionPlan
+from setting.middlewares import brotli
+from apps.news.api.serializes import NewSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare render time and bytes on the wire of DRF's JSONRenderer and "
+        "ORJSONRenderer for a page of news (no database needed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--content-length", type=int, default=5000)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        data = self.get_page(options["page_size"], options["content_length"])
+        iterations = options["iterations"]
+
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            seconds = timeit.timeit(lambda: renderer.render(data), number=iterations)
+            body = renderer.render(data)
+            self.stdout.write(
+                f"{type(renderer).__name__}: "
+                f"{seconds / iterations * 1000:.2f} ms/page, {len(body)} bytes"
+            )
+
+        body = ORJSONRenderer().render(data)
+        self.stdout.write(f"gzip: {len(gzip.compress(body))} bytes")
+        if brotli is not None:
+            self.stdout.write(f"brotli: {len(brotli.compress(body, quality=5))} bytes")
+
+    def get_page(self, page_size, content_length):
+        now = timezone.now()
+        verticals = [vertical for vertical, _ in SubscriptionPlan.VERTICAL_CHOICES]
+        news = [
+            New(
+                id=uuid.uuid4(),
+                title=f"Notícia {i}",
+                subtitle=f"Subtítulo da notícia {i}",
+                content=("Conteúdo da notícia. " * content_length)[:content_length],
+                excerpt="Conteúdo da notícia. " * 10,
+                picture=f"news_pictures/{i}.jpg",
+                author_id=1,
+                author_name="writer@jota.info",
+                status=New.PUBLISHED,
+                is_exclusive=i % 2 == 0,
+                verticals=verticals[: i % len(verticals) + 1],
+                published_at=now - timedelta(hours=i),
+                updated_at=now,
+            )
+            for i in range(page_size)
+        ]
+        plan = {
+            "id": uuid.uuid4(),
+            "name": "Pro",
+            "price": Decimal("29.99"),
+            "created_at": now,
+        }
+        return {
+            "count": page_size,
+            "next": None,
+            "previous": None,
+            "results": NewSerializer(news, many=True).data,
+            "plan": plan,
+        }
@@ -0,0 +1,65 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.news.models import New
+from apps.news.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the news picture blobs (originals and derivatives) that no "
+        "news references anymore, soft deleted news included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Keep blobs modified less than this many seconds ago, they "
+            "may belong to a transaction not committed yet",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        field = New._meta.get_field("picture")
+        storage = field.storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError("New.picture is not content addressed")
+
+        referenced = self.get_referenced_names()
+        deadline = time.time() - options["min_age"]
+        dry_run = options["dry_run"]
+        deleted = kept = freed = 0
+        root = storage.path(field.upload_to)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+                stat = os.stat(path)
+                if name in referenced or stat.st_mtime > deadline:
+                    kept += 1
+                    continue
+                deleted += 1
+                freed += stat.st_size
+                if dry_run:
+                    self.stdout.write(f"Would delete {name}")
+                else:
+                    storage.purge(name)
+
+        verb = "Would free" if dry_run else "Freed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {freed} bytes: {deleted} blobs unreferenced, {kept} kept"
+            )
+        )
+
+    def get_referenced_names(self):
+        referenced = set()
+        rows = New.all_objects.values_list("picture", "picture_derivatives")
+        for picture, derivatives in rows.iterator(chunk_size=5000):
+            referenced.add(picture)
+            referenced.update(derivative["name"] for derivative in derivatives or [])
+        return referenced
@@ -0,0 +1,356 @@
+import io
+import os
+import csv
+import time
+import uuid
+import itertools
+
+import orjson
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.news import cache as feed_cache
+from apps.news.models import New
+from apps.account.models import User, SubscriptionPlan
+
+# Namespace of the ids derived from non-UUID source ids or line numbers, so
+# importing the same file twice upserts instead of duplicating
+IMPORT_NAMESPACE = uuid.UUID("5b2f9d0e-7c1a-4a8e-9a53-0c8e6f1d2b47")
+IMPORT_FIELDS = [
+    "id",
+    "title",
+    "subtitle",
+    "picture",
+    "content",
+    "excerpt",
+    "is_exclusive",
+    "published_at",
+    "author_id",
+    "author_name",
+    "status",
+    "verticals",
+    "notify",
+]
+STAGING_TABLE = "news_import_staging"
+COPY_NULL = r"\N"
+TRUE_VALUES = {"1", "t", "true", "yes", "sim"}
+FALSE_VALUES = {"", "0", "f", "false", "no", "nao", "não"}
+VERTICALS = {vertical for vertical, _ in SubscriptionPlan.VERTICAL_CHOICES}
+STATUSES = {status for status, _ in New.STATUS_CHOICES}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import news from a JSONL or CSV file. On PostgreSQL each batch is "
+        "loaded with COPY into a staging table and upserted by id in one "
+        "statement; other databases (or --no-copy) use bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL or CSV file")
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="Input format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--author",
+            help="Username of the author of the rows without an author column",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows committed by a previous interrupted run",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file (default: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--skip-notifications",
+            action="store_true",
+            help="Publish the imported drafts without alerting the readers",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even on PostgreSQL",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        input_format = options["format"] or self.get_format(path)
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        batch_size = options["batch_size"]
+        self.source = os.path.basename(path)
+        self.skip_notifications = options["skip_notifications"]
+        self.default_author = options["author"]
+        self.authors = {}
+        use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+
+        done = self.read_checkpoint(checkpoint) if options["resume"] else 0
+        if done:
+            self.stdout.write(f"Resuming after row {done}")
+
+        created = updated = errors = 0
+        start = time.monotonic()
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = (
+                (line, row)
+                for line, row in self.read_rows(file, input_format)
+                if line > done
+            )
+            while batch := list(itertools.islice(rows, batch_size)):
+                news = []
+                for line, row in batch:
+                    try:
+                        news.append(self.build_new(line, row))
+                    except (TypeError, ValueError) as exc:
+                        errors += 1
+                        self.stderr.write(f"Row {line}: {exc}")
+                # The last occurrence of an id wins, as in a sequential import
+                news = list({new.pk: new for new in news}.values())
+                if news:
+                    batch_created, batch_updated = self.save_batch(news, use_copy)
+                    created += batch_created
+                    updated += len(batch_updated)
+                done = batch[-1][0]
+                self.write_checkpoint(checkpoint, done)
+                elapsed = time.monotonic() - start
+                self.stdout.write(
+                    f"{done} rows read: {created} created, {updated} updated, "
+                    f"{errors} errors ({(created + updated) / max(elapsed, 1e-6):.0f} rows/s)"
+                )
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created + updated} news ({created} created, "
+                f"{updated} updated), {errors} rows rejected"
+            )
+        )
+
+    def save_batch(self, news, use_copy):
+        with transaction.atomic():
+            if use_copy:
+                created, updated = self.copy_batch(news)
+            else:
+                created, updated = self.bulk_create_batch(news)
+        feed_cache.bump_versions(
+            [feed_cache.ARTICLE_VERSION_KEY.format(pk) for pk in updated]
+        )
+        feed_cache.bump_scopes([feed_cache.ALL_SCOPE])
+        return created, updated
+
+    def get_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        if extension == ".csv":
+            return "csv"
+        raise CommandError("Cannot infer the format, use --format")
+
+    def read_rows(self, file, input_format):
+        """
+        Yield ``(row number, row)``, row numbers starting at 1.
+        """
+        if input_format == "csv":
+            yield from enumerate(csv.DictReader(file), start=1)
+            return
+        for line, text in enumerate(file, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = orjson.loads(text)
+            except orjson.JSONDecodeError:
+                row = None
+            yield line, row
+
+    def read_checkpoint(self, checkpoint):
+        try:
+            with open(checkpoint) as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_checkpoint(self, checkpoint, done):
+        with open(checkpoint, "w") as file:
+            file.write(str(done))
+
+    def build_new(self, line, row):
+        """
+        Validate a row and return the unsaved New, derived fields included.
+        """
+        if not isinstance(row, dict):
+            raise ValueError("not a JSON object")
+        new = New(
+            id=self.get_id(line, row.get("id")),
+            title=self.get_text(row, "title"),
+            subtitle=self.get_text(row, "subtitle"),
+            picture=self.get_text(row, "picture"),
+            content=self.get_text(row, "content"),
+            is_exclusive=self.get_bool(row.get("is_exclusive")),
+            published_at=self.get_datetime(row.get("published_at")),
+            status=row.get("status") or New.DRAFT,
+            verticals=self.get_verticals(row.get("verticals")),
+            author=self.get_author(row.get("author") or self.default_author),
+            notify=not self.skip_notifications,
+        )
+        if new.status not in STATUSES:
+            raise ValueError(f"invalid status {new.status!r}")
+        new.set_derived_fields()
+        return new
+
+    def get_id(self, line, value):
+        if not value:
+            return uuid.uuid5(IMPORT_NAMESPACE, f"{self.source}:{line}")
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return uuid.uuid5(IMPORT_NAMESPACE, str(value))
+
+    def get_text(self, row, name):
+        value = row.get(name)
+        if not value:
+            raise ValueError(f"{name} is required")
+        if not isinstance(value, str):
+            raise ValueError(f"{name} must be a string")
+        max_length = New._meta.get_field(name).max_length
+        if max_length and len(value) > max_length:
+            raise ValueError(f"{name} is longer than {max_length} characters")
+        return value
+
+    def get_bool(self, value):
+        if value is None or isinstance(value, bool):
+            return bool(value)
+        if str(value).lower() in TRUE_VALUES:
+            return True
+        if str(value).lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"invalid boolean {value!r}")
+
+    def get_datetime(self, value):
+        if not value:
+            return None
+        try:
+            parsed = parse_datetime(value)
+        except (TypeError, ValueError):
+            parsed = None
+        if parsed is None:
+            raise ValueError(f"invalid datetime {value!r}")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def get_verticals(self, value):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [vertical.strip() for vertical in value.split(",")]
+        if not isinstance(value, list):
+            raise ValueError(f"invalid verticals {value!r}")
+        invalid = set(value) - VERTICALS
+        if invalid:
+            raise ValueError(f"invalid verticals {sorted(invalid)}")
+        return list(dict.fromkeys(value))
+
+    def get_author(self, username):
+        if not username:
+            raise ValueError("author is required (column or --author)")
+        if username not in self.authors:
+            self.authors[username] = User.objects.filter(username=username).first()
+        author = self.authors[username]
+        if author is None:
+            raise ValueError(f"unknown author {username!r}")
+        return author
+
+    def copy_batch(self, news):
+        """
+        COPY the batch into a staging table and upsert it in one statement.
+
+        Returns the number of created news and the ids of the updated ones.
+        """
+        table = connection.ops.quote_name(New._meta.db_table)
+        columns = ", ".join(IMPORT_FIELDS)
+        updates = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in IMPORT_FIELDS[1:]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            self.copy(
+                cursor,
+                f"COPY {STAGING_TABLE} ({columns}) FROM STDIN "
+                f"WITH (FORMAT csv, NULL '{COPY_NULL}', FORCE_NULL (published_at))",
+                self.to_csv(news),
+            )
+            # xmax is 0 for the rows inserted by this statement
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}, picture_derivatives, updated_at, "
+                f"deleted_by_cascade) "
+                f"SELECT {columns}, '[]', now(), false FROM {STAGING_TABLE} "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}, "
+                f"picture_derivatives = CASE WHEN {table}.picture = EXCLUDED.picture "
+                f"THEN {table}.picture_derivatives ELSE '[]' END, "
+                f"updated_at = EXCLUDED.updated_at "
+                f"RETURNING id, xmax <> 0"
+            )
+            results = cursor.fetchall()
+            # ON COMMIT DROP only fires on the outermost commit
+            cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+        updated = [pk for pk, is_update in results if is_update]
+        return len(results) - len(updated), updated
+
+    def copy(self, cursor, sql, data):
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, io.StringIO(data))
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(data)
+
+    def to_csv(self, news):
+        buffer = io.StringIO()
+        # Quoted values are never NULL, only published_at may be (FORCE_NULL)
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        for new in news:
+            writer.writerow(
+                [
+                    new.id,
+                    new.title,
+                    new.subtitle,
+                    new.picture.name,
+                    new.content,
+                    new.excerpt,
+                    "t" if new.is_exclusive else "f",
+                    new.published_at.isoformat() if new.published_at else COPY_NULL,
+                    new.author_id,
+                    new.author_name,
+                    new.status,
+                    "{" + ",".join(new.verticals) + "}",
+                    "t" if new.notify else "f",
+                ]
+            )
+        return buffer.getvalue()
+
+    def bulk_create_batch(self, news):
+        """
+        Database agnostic path, used by SQLite and --no-copy.
+        """
+        ids = [new.pk for new in news]
+        updated = list(New.all_objects.filter(pk__in=ids).values_list("pk", flat=True))
+        update_fields = [name for name in IMPORT_FIELDS[1:] if name != "author_id"]
+        New.all_objects.bulk_create(
+            news,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=[*update_fields, "author", "updated_at"],
+        )
+        return len(news) - len(updated), updated
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.news.models import Audience
+from apps.account.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the audience index of the exclusive news from the plans of "
+        "every reader, e.g. after bulk updates that skipped the signals."
+    )
+
+    def handle(self, *args, **options):
+        rows = Audience.objects.rebuild(User.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {rows} audience rows"))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from django.contrib.postgres.search import SearchVector
+
+
+def fill_search_vector(apps, schema_editor):
+    """
+    Build the full-text document of the existing news.
+    """
+    New = apps.get_model("news", "New")
+    New.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config="portuguese")
+            + SearchVector("subtitle", weight="B", config="portuguese")
+            + SearchVector("content", weight="C", config="portuguese")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            fill_search_vector, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="new",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="news_new_search_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:51
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+from django.contrib.postgres.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Build the indexes without locking writes on the news table
+    atomic = False
+
+    dependencies = [
+        ("news", "0002_new_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(("deleted__isnull", True)),
+                fields=["-published_at", "-id"],
+                name="news_new_published_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted__isnull", True),
+                    ("is_exclusive", False),
+                    ("status", "published"),
+                ),
+                fields=["-published_at", "-id"],
+                name="news_new_public_feed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted__isnull", True),
+                    ("is_exclusive", True),
+                    ("status", "published"),
+                ),
+                fields=["-published_at", "-id"],
+                name="news_new_exclusive_feed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="new",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("deleted__isnull", True)),
+                fields=["verticals"],
+                name="news_new_verticals_gin",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:51
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 280
+BATCH_SIZE = 500
+
+
+def fill_excerpt(apps, schema_editor):
+    """
+    Build the excerpt of the existing news.
+    """
+    New = apps.get_model("news", "New")
+    batch = []
+    for new in New.objects.only("id", "content").iterator(chunk_size=BATCH_SIZE):
+        new.excerpt = Truncator(strip_tags(new.content)).chars(EXCERPT_LENGTH)
+        batch.append(new)
+        if len(batch) == BATCH_SIZE:
+            New.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    New.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_new_read_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.RunPython(fill_excerpt, reverse_code=migrations.RunPython.noop),
+    ]
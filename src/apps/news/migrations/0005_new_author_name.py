@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_author_name(apps, schema_editor):
+    """
+    Copy the author name (User.__str__, the email) to the existing news.
+    """
+    New = apps.get_model("news", "New")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    New.objects.update(
+        author_name=Subquery(
+            User.objects.filter(pk=OuterRef("author_id")).values("email")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_new_excerpt"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="author_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_author_name, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0005_new_author_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0006_new_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="picture_derivatives",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
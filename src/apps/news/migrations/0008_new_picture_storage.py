@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:08
+
+import apps.news.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0007_new_picture_derivatives"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="new",
+            name="picture",
+            field=models.ImageField(
+                storage=apps.news.storage.get_picture_storage, upload_to="news_pictures"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0008_new_picture_storage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationFanout",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_chunks", models.PositiveIntegerField(default=0)),
+                ("done_chunks", models.PositiveIntegerField(default=0)),
+                ("failed_chunks", models.PositiveIntegerField(default=0)),
+                (
+                    "sent",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="E-mails enviados"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "news",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_fanouts",
+                        to="news.new",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Envio de alertas",
+                "verbose_name_plural": "Envios de alertas",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:17
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+DIGEST_TASK = "apps.news.tasks.send_digest"
+DIGEST_SCHEDULES = (
+    # name, frequency, schedule type
+    ("news-digest-hourly", "hourly", "H"),
+    ("news-digest-daily", "daily", "D"),
+)
+
+
+def create_digest_schedules(apps, schema_editor):
+    """
+    Run the hourly digest at every full hour and the daily one at midnight.
+    """
+    Schedule = apps.get_model("django_q", "Schedule")
+    now = timezone.localtime()
+    next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    next_runs = {
+        "hourly": next_hour,
+        "daily": now.replace(hour=0, minute=0, second=0, microsecond=0)
+        + timedelta(days=1),
+    }
+    for name, frequency, schedule_type in DIGEST_SCHEDULES:
+        Schedule.objects.update_or_create(
+            name=name,
+            defaults={
+                "func": DIGEST_TASK,
+                "kwargs": f"frequency={frequency!r}",
+                "schedule_type": schedule_type,
+                "repeats": -1,
+                "next_run": next_runs[frequency],
+            },
+        )
+
+
+def delete_digest_schedules(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name__in=[name for name, _, _ in DIGEST_SCHEDULES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0010_notification"),
+        ("django_q", "0018_task_success_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("immediate", "Imediata"),
+                            ("hourly", "Resumo por hora"),
+                            ("daily", "Resumo diário"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("since", models.DateTimeField()),
+                ("until", models.DateTimeField()),
+                ("articles", models.PositiveIntegerField(default=0)),
+                (
+                    "digests",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Resumos distintos"
+                    ),
+                ),
+                (
+                    "sent",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="E-mails enviados"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Resumo de notícias",
+                "verbose_name_plural": "Resumos de notícias",
+                "ordering": ["-until"],
+                "indexes": [
+                    models.Index(
+                        fields=["frequency", "-until"], name="news_digest_frequency_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_digest_schedules, delete_digest_schedules),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+PUBLISHER_SCHEDULE = "news-publisher"
+PUBLISHER_TASK = "apps.news.tasks.publish_due_news"
+LEGACY_PUBLISH_TASK = "apps.news.tasks.publish_news"
+
+
+def create_publisher_schedule(apps, schema_editor):
+    """
+    Replace the one-off publish_news schedules of each draft with the
+    publish_due_news sweep, run every minute.
+    """
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=LEGACY_PUBLISH_TASK, schedule_type="O").delete()
+    Schedule.objects.update_or_create(
+        name=PUBLISHER_SCHEDULE,
+        defaults={
+            "func": PUBLISHER_TASK,
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_publisher_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=PUBLISHER_SCHEDULE).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0011_notificationdigest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("django_q", "0018_task_success_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(("deleted__isnull", True), ("status", "draft")),
+                fields=["published_at"],
+                name="news_due_idx",
+            ),
+        ),
+        migrations.RunPython(create_publisher_schedule, delete_publisher_schedule),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0012_due_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted__isnull", True),
+                    models.Q(
+                        ("status", "published"),
+                        models.Q(("published_at__isnull", False), ("status", "draft")),
+                        _connector="OR",
+                    ),
+                ),
+                fields=["is_exclusive", "-published_at", "-id"],
+                name="news_new_embargo_feed_idx",
+            ),
+        ),
+    ]
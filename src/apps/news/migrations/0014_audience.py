@@ -0,0 +1,79 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_audience(apps, schema_editor):
+    """
+    Index the readers of the exclusive plans already subscribed.
+    """
+    Audience = apps.get_model("news", "Audience")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    SubscriptionPlan = apps.get_model("account", "SubscriptionPlan")
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"INSERT INTO {quote(Audience._meta.db_table)} (vertical, user_id) "
+        "SELECT DISTINCT unnest(plan.verticals), reader.id "
+        f"FROM {quote(User._meta.db_table)} AS reader "
+        f"JOIN {quote(SubscriptionPlan._meta.db_table)} AS plan "
+        "ON plan.id = reader.subscription_plan_id "
+        "WHERE reader.user_type = 'reader' AND plan.is_exclusive"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0013_embargo_feed_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Audience",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "vertical",
+                    models.CharField(
+                        choices=[
+                            ("power", "Poder"),
+                            ("tax", "Imposto"),
+                            ("health", "Saúde"),
+                            ("energy", "Energia"),
+                            ("labor", "Trabalhista"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="audiences",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Audiência",
+                "verbose_name_plural": "Audiências",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("vertical", "user"), name="news_audience_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_audience, migrations.RunPython.noop),
+    ]
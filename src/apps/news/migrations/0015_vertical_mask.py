@@ -0,0 +1,81 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:24
+
+import apps.account.fields
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0014_audience"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="new",
+            name="news_new_verticals_gin",
+        ),
+        migrations.AddField(
+            model_name="new",
+            name="vertical_mask",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                models.Case(
+                                    models.When(
+                                        then=models.Value(1),
+                                        verticals__contains=["power"],
+                                    ),
+                                    default=models.Value(0),
+                                ),
+                                "+",
+                                models.Case(
+                                    models.When(
+                                        then=models.Value(2),
+                                        verticals__contains=["tax"],
+                                    ),
+                                    default=models.Value(0),
+                                ),
+                            ),
+                            "+",
+                            models.Case(
+                                models.When(
+                                    then=models.Value(4), verticals__contains=["health"]
+                                ),
+                                default=models.Value(0),
+                            ),
+                        ),
+                        "+",
+                        models.Case(
+                            models.When(
+                                then=models.Value(8), verticals__contains=["energy"]
+                            ),
+                            default=models.Value(0),
+                        ),
+                    ),
+                    "+",
+                    models.Case(
+                        models.When(
+                            then=models.Value(16), verticals__contains=["labor"]
+                        ),
+                        default=models.Value(0),
+                    ),
+                ),
+                output_field=apps.account.fields.VerticalMaskField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(("deleted__isnull", True)),
+                fields=["vertical_mask"],
+                name="news_new_vertical_mask_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0015_vertical_mask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="notify",
+            field=models.BooleanField(
+                default=True, editable=False, verbose_name="Alertar os leitores"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+RETRY_SCHEDULE = "news-notification-retry"
+RETRY_TASK = "apps.news.tasks.drain_notifications"
+
+
+def create_retry_schedule(apps, schema_editor):
+    """
+    Resume the alerts left pending after a failed batch, once their
+    retry delay is over.
+    """
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name=RETRY_SCHEDULE,
+        defaults={
+            "func": RETRY_TASK,
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_retry_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=RETRY_SCHEDULE).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0016_new_notify"),
+        ("django_q", "0018_task_success_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(create_retry_schedule, delete_retry_schedule),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_notified_at(apps, schema_editor):
+    """
+    The news published so far were alerted at their publication time.
+    """
+    New = apps.get_model("news", "New")
+    New.objects.filter(status="published", notify=True).update(
+        notified_at=F("published_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0017_notification_next_attempt_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="new",
+            name="notified_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="new",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted__isnull", True), ("notified_at__isnull", False)
+                ),
+                fields=["notified_at"],
+                name="news_notified_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_notified_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:42
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    A column can't be altered into a generated one: the filled column and
+    its index are dropped, then the generated column computes the document
+    of every existing row.
+    """
+
+    dependencies = [
+        ("news", "0018_new_notified_at"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="new",
+            name="news_new_search_gin",
+        ),
+        migrations.RemoveField(
+            model_name="new",
+            name="search_vector",
+        ),
+        migrations.AddField(
+            model_name="new",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.SearchVector(
+                            "title", config="portuguese", weight="A"
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            "subtitle", config="portuguese", weight="B"
+                        ),
+                        django.contrib.postgres.search.SearchConfig("portuguese"),
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "content", config="portuguese", weight="C"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("portuguese"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="new",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="news_new_search_gin"
+            ),
+        ),
+    ]
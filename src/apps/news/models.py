@@ -1,17 +1,107 @@
 import uuid
+from datetime import timedelta
 
-from django.db import models
+from django.db import models, connection, transaction
 from safedelete import models as models_safedelete
-from django_q.tasks import schedule
+from django.utils import timezone
+from django_q.tasks import async_task
+from django.db.models import F, Q, Case, When
 from author.decorators import with_author
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
 from django.contrib.auth import get_user_model
+from safedelete.managers import SafeDeleteManager
+from safedelete.queryset import SafeDeleteQueryset
 from django.utils.translation import gettext_lazy as _
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.contrib.postgres.indexes import GinIndex
 
+from apps.news import cache as feed_cache
+from apps.news.storage import get_picture_storage
+from apps.account.fields import get_vertical_mask_field
 from apps.account.models import SubscriptionPlan
 
 User = get_user_model()
 
+SEARCH_CONFIG = "portuguese"
+SEARCH_VECTOR = (
+    SearchVector("title", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("subtitle", weight="B", config=SEARCH_CONFIG)
+    + SearchVector("content", weight="C", config=SEARCH_CONFIG)
+)
+DERIVATIVES_TASK = "apps.news.tasks.generate_picture_derivatives"
+BULK_BATCH_SIZE = 500
+
+
+class NewQuerySet(SafeDeleteQueryset):
+    def published(self):
+        """
+        Published news. In embargo visibility mode, also the scheduled drafts
+        whose ``published_at`` has passed, before publish_due_news flips them.
+        """
+        if not feed_cache.is_embargo_visibility():
+            return self.filter(status=New.PUBLISHED)
+        return self.filter(
+            Q(status=New.PUBLISHED)
+            | Q(status=New.DRAFT, published_at__lte=timezone.now())
+        )
+
+    def visible_to(self, user):
+        """
+        Restrict to the news ``user`` is entitled to read.
+        """
+        if user.user_type == User.WRITER:
+            return self
+        news = self.published()
+        if not user.subscription_plan:
+            return news.filter(is_exclusive=False)
+        return news.filter(
+            is_exclusive=True,
+            vertical_mask__overlap=user.subscription_plan.vertical_mask,
+        )
+
+    def bulk_save(self, news, fields=None):
+        """
+        Save many news with the side effects of New.save (derived fields,
+        cache invalidation) in a constant number of queries.
+
+        Inserts ``news`` when ``fields`` is None, else updates ``fields``.
+        """
+        pictures_changed = [new for new in news if new.is_picture_changed()]
+        for new in pictures_changed:
+            new.picture_derivatives = []
+        # e.g. publishing only flips status, author_name would cost a query
+        # per row
+        derived = fields is None or bool(New.DERIVED_FROM & set(fields))
+        if derived:
+            for new in news:
+                new.set_derived_fields()
+        with transaction.atomic():
+            if fields is None:
+                self.bulk_create(news, batch_size=BULK_BATCH_SIZE)
+            else:
+                now = timezone.now()
+                for new in news:
+                    new.updated_at = now
+                fields = {*fields, "picture_derivatives", "updated_at"}
+                if derived:
+                    fields |= {"excerpt", "author_name"}
+                self.bulk_update(news, fields, batch_size=BULK_BATCH_SIZE)
+            for new in pictures_changed:
+                new.queue_picture_derivatives()
+        feed_cache.invalidate_articles(news)
+        for new in news:
+            new.reset_loaded_values()
+        return news
+
+    def due(self, now=None):
+        """
+        Drafts whose publication time has passed, served by the partial
+        ``news_due_idx`` index.
+        """
+        return self.filter(status=New.DRAFT, published_at__lte=now or timezone.now())
+
 
 @with_author
 class New(models_safedelete.SafeDeleteModel):
@@ -26,12 +116,20 @@ class New(models_safedelete.SafeDeleteModel):
         (DRAFT, _("Rascunho")),
     )
 
+    EXCERPT_LENGTH = 280
+    # Sources of the excerpt and author_name fields
+    DERIVED_FROM = {"content", "author", "author_id"}
+
     _safedelete_policy = models_safedelete.SOFT_DELETE_CASCADE
+    objects = SafeDeleteManager.from_queryset(NewQuerySet)()
+
     id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
     title = models.CharField(max_length=255)
     subtitle = models.CharField(max_length=500)
-    picture = models.ImageField(upload_to="news_pictures")
+    picture = models.ImageField(upload_to="news_pictures", storage=get_picture_storage)
     content = models.TextField()
+    # Plain text preview of content, lets feeds skip the content column
+    excerpt = models.CharField(max_length=300, blank=True, editable=False)
     is_exclusive = models.BooleanField(
         default=False, verbose_name=_("Acesso exclusivo ?")
     )
@@ -42,29 +140,386 @@ class New(models_safedelete.SafeDeleteModel):
         on_delete=models.PROTECT,
         related_name="news",
     )
+    # Copy of str(author) so serializing news never loads the author row
+    author_name = models.CharField(max_length=255, blank=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=DRAFT)
+    # Off for backfilled news, which publish_due_news publishes silently
+    notify = models.BooleanField(
+        default=True, editable=False, verbose_name=_("Alertar os leitores")
+    )
+    # Set by notify_news on the first alert, selects the news of the digests
+    notified_at = models.DateTimeField(null=True, blank=True, editable=False)
     verticals = ArrayField(
         models.CharField(max_length=50, choices=SubscriptionPlan.VERTICAL_CHOICES),
         blank=True,
         default=list,
     )
+    # Bitmask of verticals, matched against the plan's one
+    vertical_mask = get_vertical_mask_field(SubscriptionPlan.VERTICAL_CHOICES)
+    # Resized WebP/AVIF versions of picture, filled in the background by
+    # generate_picture_derivatives: [{"name", "width", "height", "format"}]
+    picture_derivatives = models.JSONField(default=list, blank=True, editable=False)
+    # Weighted full-text document (title > subtitle > content), computed by
+    # the database on every write (bulk, COPY and raw writes included)
+    search_vector = models.GeneratedField(
+        expression=SEARCH_VECTOR, output_field=SearchVectorField(), db_persist=True
+    )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _("Notícia")
         verbose_name_plural = _("Notícias")
         ordering = ["-published_at"]
+        # Partial indexes follow the predicates of NewViewSet.get_queryset,
+        # safedelete adds "deleted IS NULL" to every query.
+        indexes = [
+            GinIndex(fields=["search_vector"], name="news_new_search_gin"),
+            models.Index(
+                fields=["-published_at", "-id"],
+                name="news_new_published_idx",
+                condition=Q(deleted__isnull=True),
+            ),
+            models.Index(
+                fields=["-published_at", "-id"],
+                name="news_new_public_feed_idx",
+                condition=Q(
+                    deleted__isnull=True, status="published", is_exclusive=False
+                ),
+            ),
+            models.Index(
+                fields=["-published_at", "-id"],
+                name="news_new_exclusive_feed_idx",
+                condition=Q(
+                    deleted__isnull=True, status="published", is_exclusive=True
+                ),
+            ),
+            models.Index(
+                fields=["vertical_mask"],
+                name="news_new_vertical_mask_idx",
+                condition=Q(deleted__isnull=True),
+            ),
+            # Feeds of the embargo visibility mode, published or scheduled
+            models.Index(
+                fields=["is_exclusive", "-published_at", "-id"],
+                name="news_new_embargo_feed_idx",
+                condition=Q(deleted__isnull=True)
+                & (
+                    Q(status="published")
+                    | Q(status="draft", published_at__isnull=False)
+                ),
+            ),
+            # Due queue of the publisher, only the scheduled drafts
+            models.Index(
+                fields=["published_at"],
+                name="news_due_idx",
+                condition=Q(deleted__isnull=True, status="draft"),
+            ),
+            # Digest window of send_digest
+            models.Index(
+                fields=["notified_at"],
+                name="news_notified_idx",
+                condition=Q(deleted__isnull=True, notified_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded values to know which feeds the article left on save
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if value is not models.DEFERRED
+        }
+        return instance
+
+    def set_derived_fields(self):
+        self.excerpt = Truncator(strip_tags(self.content)).chars(self.EXCERPT_LENGTH)
+        if self.author_id:
+            self.author_name = str(self.author)
+
+    def reset_loaded_values(self):
+        self._loaded_values = {
+            "status": self.status,
+            "is_exclusive": self.is_exclusive,
+            "verticals": list(self.verticals),
+            "published_at": self.published_at,
+            "picture": self.picture.name,
+        }
+
+    def is_picture_changed(self):
+        loaded = getattr(self, "_loaded_values", {})
+        return not self.picture._committed or self.picture.name != loaded.get("picture")
+
+    def queue_picture_derivatives(self):
+        """
+        Generate the picture derivatives once the transaction commits, off
+        the request.
+        """
+        if not self.picture:
+            return
+        news_id = str(self.id)
+        transaction.on_commit(lambda: async_task(DERIVATIVES_TASK, news_id=news_id))
+
     def save(self, *args, **kwargs):
+        picture_changed = self.is_picture_changed()
+        if picture_changed:
+            self.picture_derivatives = []
+        self.set_derived_fields()
         obj = super().save(*args, **kwargs)
-        if self.status == self.DRAFT and self.published_at:
-            # Schedule the task to send email alerts
-            schedule(
-                "apps.news.tasks.publish_news",
-                news_id=str(self.id),
-                schedule_type="O",
-                next_run=self.published_at,
-            )
+        feed_cache.invalidate_article(self)
+        self.reset_loaded_values()
+        if picture_changed:
+            self.queue_picture_derivatives()
         return obj
+
+
+class NotificationFanout(models.Model):
+    """
+    Progress of the email alerts of a published news article, sent from the
+    Notification outbox by parallel django-q dispatcher tasks.
+    """
+
+    news = models.ForeignKey(
+        New, on_delete=models.CASCADE, related_name="notification_fanouts"
+    )
+    total_chunks = models.PositiveIntegerField(default=0)
+    done_chunks = models.PositiveIntegerField(default=0)
+    failed_chunks = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0, verbose_name=_("E-mails enviados"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Envio de alertas")
+        verbose_name_plural = _("Envios de alertas")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.news} ({self.done_chunks}/{self.total_chunks})"
+
+    @property
+    def progress(self):
+        if not self.total_chunks:
+            return 1.0 if self.finished_at else 0.0
+        return self.done_chunks / self.total_chunks
+
+
+class AudienceQuerySet(models.QuerySet):
+    def rebuild(self, users):
+        """
+        Recompute the rows of ``users`` (a User queryset) with one DELETE and
+        one ``INSERT ... SELECT``.
+        """
+        entitled = users.filter(
+            user_type=User.READER, subscription_plan__is_exclusive=True
+        )
+        select, params = (
+            entitled.order_by()
+            .values_list("id", "subscription_plan__verticals")
+            .query.sql_with_params()
+        )
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with transaction.atomic():
+            self.filter(user__in=users.values("id")).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (vertical, user_id) "
+                    "SELECT DISTINCT unnest(readers.verticals), readers.id "
+                    f"FROM ({select}) AS readers (id, verticals) "
+                    "ON CONFLICT (vertical, user_id) DO NOTHING",
+                    params,
+                )
+                return cursor.rowcount
+
+    def recipients(self, verticals):
+        """
+        Ids of the readers entitled to the exclusive news of ``verticals``:
+        the union of the audiences of each vertical.
+        """
+        return self.filter(vertical__in=verticals).values("user_id")
+
+
+class Audience(models.Model):
+    """
+    Precomputed audience of the exclusive news: one row per vertical of the
+    exclusive plan of each reader, kept in sync by apps.news.signals (and
+    the rebuild_audience command after bulk changes).
+    """
+
+    objects = AudienceQuerySet.as_manager()
+
+    vertical = models.CharField(
+        max_length=50, choices=SubscriptionPlan.VERTICAL_CHOICES
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="audiences")
+
+    class Meta:
+        verbose_name = _("Audiência")
+        verbose_name_plural = _("Audiências")
+        constraints = [
+            # Also the index resolving the readers of a vertical
+            models.UniqueConstraint(
+                fields=["vertical", "user"], name="news_audience_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.vertical}: {self.user}"
+
+
+class NotificationDigest(models.Model):
+    """
+    One run of the news digest of a notification frequency, covering the
+    news published in [since, until).
+    """
+
+    frequency = models.CharField(
+        max_length=20, choices=User.NOTIFICATION_FREQUENCY_CHOICES
+    )
+    since = models.DateTimeField()
+    until = models.DateTimeField()
+    articles = models.PositiveIntegerField(default=0)
+    digests = models.PositiveIntegerField(
+        default=0, verbose_name=_("Resumos distintos")
+    )
+    sent = models.PositiveIntegerField(default=0, verbose_name=_("E-mails enviados"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Resumo de notícias")
+        verbose_name_plural = _("Resumos de notícias")
+        ordering = ["-until"]
+        indexes = [
+            models.Index(
+                fields=["frequency", "-until"], name="news_digest_frequency_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_frequency_display()} ({self.since} - {self.until})"
+
+
+class NotificationQuerySet(models.QuerySet):
+    def enqueue(self, news, users):
+        """
+        Add one pending row per user of ``users`` for ``news`` with a single
+        ``INSERT ... SELECT``, skipping the users already in the outbox.
+        Returns the number of rows added.
+        """
+        select, params = users.order_by().values("id").query.sql_with_params()
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (news_id, user_id, status, attempts, created_at) "
+                f"SELECT %s, recipients.id, %s, 0, now() FROM ({select}) AS recipients "
+                "ON CONFLICT (news_id, user_id) DO NOTHING",
+                [news.pk, self.model.PENDING, *params],
+            )
+            return cursor.rowcount
+
+    def claim(self, batch_size, news_id=None):
+        """
+        Lock up to ``batch_size`` pending rows due for an attempt, skipping
+        the rows locked by other dispatchers. Must run in a transaction,
+        which holds the rows until they are marked.
+        """
+        pending = self.filter(
+            Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()),
+            status=self.model.PENDING,
+        )
+        if news_id is not None:
+            pending = pending.filter(news_id=news_id)
+        return list(
+            pending.order_by("id")
+            .select_for_update(skip_locked=True, of=("self",))
+            .values_list("id", "news_id", "user__email")[:batch_size]
+        )
+
+    def mark_sent(self, ids):
+        return self.filter(id__in=ids).update(
+            status=self.model.SENT, attempts=F("attempts") + 1, sent_at=timezone.now()
+        )
+
+    def mark_failed(self, ids):
+        """
+        Count a failed attempt, giving up after ``MAX_ATTEMPTS``. The next
+        attempt waits ``RETRY_DELAY``, doubled after each failure.
+        """
+        now = timezone.now()
+        return self.filter(id__in=ids).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=Case(
+                *[
+                    When(
+                        attempts=attempts,
+                        then=models.Value(now + self.model.RETRY_DELAY * 2**attempts),
+                    )
+                    for attempts in range(self.model.MAX_ATTEMPTS - 1)
+                ],
+                default=F("next_attempt_at"),
+            ),
+            status=Case(
+                When(
+                    attempts__gte=self.model.MAX_ATTEMPTS - 1,
+                    then=models.Value(self.model.FAILED),
+                ),
+                default=models.Value(self.model.PENDING),
+            ),
+        )
+
+
+class Notification(models.Model):
+    """
+    Outbox of the email alerts: one row per news article and reader, drained
+    by the dispatcher tasks. The unique pair makes each reader alerted at
+    most once per article, however many times the article is published.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, _("Pendente")),
+        (SENT, _("Enviado")),
+        (FAILED, _("Falhou")),
+    )
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = timedelta(minutes=1)
+
+    objects = NotificationQuerySet.as_manager()
+
+    news = models.ForeignKey(
+        New, on_delete=models.CASCADE, related_name="notifications"
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="news_notifications"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Alerta de notícia")
+        verbose_name_plural = _("Alertas de notícias")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["news", "user"], name="news_notification_unique"
+            ),
+        ]
+        indexes = [
+            # Dispatchers only scan the rows left to send
+            models.Index(
+                fields=["news", "id"],
+                name="news_notification_pending_idx",
+                condition=Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.news} -> {self.user} ({self.status})"
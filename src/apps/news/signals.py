@@ -0,0 +1,64 @@
+from django.utils import timezone
+from django.dispatch import receiver
+from django.db.models.signals import post_save
+
+from apps.news import cache as feed_cache
+from apps.account.models import User, SubscriptionPlan
+
+# Fields the audience of the exclusive news depends on
+AUDIENCE_USER_FIELDS = {"user_type", "subscription_plan", "subscription_plan_id"}
+AUDIENCE_PLAN_FIELDS = {"is_exclusive", "verticals"}
+
+
+@receiver(post_save, sender=User)
+def sync_author_name(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Keep the author name copied on the news of a user up to date, along with
+    their cached payloads, feeds and validators.
+    """
+    if created:
+        return
+    # e.g. the last_login save of every login
+    if update_fields is not None and "email" not in update_fields:
+        return
+    from apps.news.models import New
+
+    author_name = str(instance)
+    pks = list(
+        New.all_objects.filter(author=instance)
+        .exclude(author_name=author_name)
+        .values_list("pk", flat=True)
+    )
+    if not pks:
+        return
+    New.all_objects.filter(pk__in=pks).update(
+        author_name=author_name, updated_at=timezone.now()
+    )
+    feed_cache.invalidate_article_ids(pks)
+
+
+@receiver(post_save, sender=User)
+def sync_user_audience(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the audience rows of a user in line with its plan.
+    """
+    if update_fields is not None and not AUDIENCE_USER_FIELDS & set(update_fields):
+        return
+    from apps.news.models import Audience
+
+    Audience.objects.rebuild(User.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def sync_plan_audience(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Recompute the audience of the subscribers of a plan when its
+    entitlement changes.
+    """
+    if created:
+        return
+    if update_fields is not None and not AUDIENCE_PLAN_FIELDS & set(update_fields):
+        return
+    from apps.news.models import Audience
+
+    Audience.objects.rebuild(instance.users.all())
@@ -0,0 +1,68 @@
+import os
+import hashlib
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+
+PICTURE_STORAGE = "news_pictures"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that stores each blob once, under the SHA-256 of
+    its content: ``<upload dir>/ab/cd/abcd....jpg``.
+
+    Saving a file that is already stored only returns its name, and names
+    never change content, so they can be served as immutable. Blobs may be
+    shared by many rows, ``delete`` is therefore a no-op and unreferenced
+    blobs are removed by the ``gc_pictures`` command.
+    """
+
+    hash_algorithm = "sha256"
+
+    def __init__(self, *args, **kwargs):
+        # Two writers of the same name write the same bytes
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(*args, **kwargs)
+
+    def get_digest(self, content):
+        digest = hashlib.new(self.hash_algorithm)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_content_name(self, name, content):
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+        digest = self.get_digest(content)
+        return os.path.join(directory, digest[:2], digest[2:4], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            # Reference-only write, refresh the blob so gc_pictures keeps it
+            # until the referencing row is committed
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                # Purged by gc_pictures since exists(), write it again
+                pass
+        return super().save(name, content, max_length=max_length)
+
+    def delete(self, name):
+        pass
+
+    def purge(self, name):
+        """
+        Really delete a blob, for garbage collection only.
+        """
+        super().delete(name)
+
+
+def get_picture_storage():
+    return storages[PICTURE_STORAGE]
@@ -1,55 +1,386 @@
+import math
+import smtplib
+import itertools
 from logging import Logger
+from datetime import timedelta
+
+from django.db import transaction
+from django.conf import settings
+from django.utils import timezone
+from django_q.tasks import async_task
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
 
 log = Logger(__name__)
 
 
-def send_email(subject, recipient_list, body):
+def send_emails(subject, body, recipients, batch_size=None, connection=None):
+    """
+    Send ``subject``/``body`` to each of ``recipients`` (one message per
+    recipient) over a single SMTP connection, ``batch_size`` messages per
+    send_messages call. Returns the number of messages sent.
+
+    A connection already open is left open for the caller to reuse.
+    """
+    batch_size = batch_size or getattr(settings, "NEWS_EMAIL_BATCH_SIZE", 100)
+    connection = connection or get_connection()
+    recipients = iter(recipients)
+    sent = 0
+    # Opened once for every batch
+    opened = connection.open()
+    try:
+        while batch := list(itertools.islice(recipients, batch_size)):
+            messages = [
+                EmailMessage(subject, body, to=[email], connection=connection)
+                for email in batch
+            ]
+            sent += connection.send_messages(messages) or 0
+    finally:
+        if opened:
+            connection.close()
+    return sent
+
+
+CHUNK_TASK = "apps.news.tasks.drain_notifications"
+CHUNK_HOOK = "apps.news.tasks.on_news_chunk_done"
+MAX_CHUNK_ATTEMPTS = 3
+
+
+def get_recipients(news):
     """
-    Mock function to send an email.
-    In a real application, you would use Django's email sending capabilities.
+    Readers entitled to the alert of ``news``, except those who prefer
+    digests.
     """
-    log.info(f"Sending email with subject: {subject} to {recipient_list}")
-    log.info(f"Email body: {body}")
-    # Here you would integrate with an actual email service
-    # e.g., send_mail(subject, body, from_email, recipient_list)
+    from apps.news.models import Audience
+    from apps.account.models import User
+
+    users = User.objects.filter(
+        user_type=User.READER, notification_frequency=User.IMMEDIATE
+    )
+    if news.is_exclusive:
+        users = users.filter(id__in=Audience.objects.recipients(news.verticals))
+    return users
+
+
+def dispatch_chunk(fanout_id, news_id, attempt=1):
+    async_task(
+        CHUNK_TASK,
+        fanout_id=fanout_id,
+        news_id=news_id,
+        attempt=attempt,
+        group=f"news-fanout-{fanout_id}",
+        hook=CHUNK_HOOK,
+    )
 
 
 def publish_news(news_id=None):
     """
-    Send an alert to all users about a new news article.
+    Publish a news article now and alert the readers entitled to it.
     """
     from apps.news.models import New
-    from apps.account.models import User
 
     log.info(f"Publishing news with ID: {news_id}")
     if not news_id:
         log.warning("No news ID provided.")
         return
     news: New = New.objects.get(id=news_id)
-    users = (
-        User.objects.select_related(
-            "subscription_plan",
-        )
-        .prefetch_related(
-            "subscription_plan__verticals",
+    news.status = New.PUBLISHED
+    news.save()
+    notify_news(news)
+
+
+def publish_due_news():
+    """
+    Publisher sweep, scheduled every minute: publish the drafts whose
+    ``published_at`` has passed and alert their readers. Returns the number
+    of news published.
+
+    Due drafts are claimed in batches with ``FOR UPDATE SKIP LOCKED`` from
+    the ``news_due_idx`` index, so overlapping sweeps never publish a draft
+    twice and the cost only depends on the due drafts. Scheduling,
+    rescheduling or unscheduling a draft is a plain ``published_at`` update.
+    Drafts imported with ``--skip-notifications`` are published without
+    alerts.
+    """
+    from apps.news.models import New
+
+    batch_size = getattr(settings, "NEWS_PUBLISH_BATCH_SIZE", 500)
+    published = 0
+    while True:
+        with transaction.atomic():
+            news = list(
+                New.objects.due()
+                .order_by("published_at")
+                .select_for_update(skip_locked=True)[:batch_size]
+            )
+            if not news:
+                break
+            for new in news:
+                new.status = New.PUBLISHED
+            New.objects.bulk_save(news, fields=["status"])
+        for new in news:
+            if new.notify:
+                notify_news(new)
+        published += len(news)
+    if published:
+        log.info(f"Published {published} scheduled news")
+    return published
+
+
+def notify_news(news):
+    """
+    Alert the readers entitled to a published news article.
+
+    The recipients are added to the Notification outbox with one query, then
+    drained by parallel dispatcher tasks tracked by a NotificationFanout.
+    """
+    from apps.news.models import New, Notification, NotificationFanout
+
+    # Only the first alert counts, republished news never enter a digest twice
+    New.all_objects.filter(pk=news.pk, notified_at__isnull=True).update(
+        notified_at=timezone.now()
+    )
+    Notification.objects.enqueue(news, get_recipients(news))
+    # Rows left pending by an earlier run are sent too
+    pending = news.notifications.filter(status=Notification.PENDING).count()
+    chunk_size = getattr(settings, "NEWS_NOTIFICATION_CHUNK_SIZE", 1000)
+    dispatchers = math.ceil(pending / chunk_size)
+    fanout = NotificationFanout.objects.create(news=news, total_chunks=dispatchers)
+    if not dispatchers:
+        finish_fanout(fanout)
+        return
+    for _ in range(dispatchers):
+        dispatch_chunk(fanout.pk, str(news.pk))
+    log.info(f"Dispatched {dispatchers} alert dispatchers for news: {news.title}")
+
+
+def drain_notifications(fanout_id=None, news_id=None, attempt=1):
+    """
+    Send the pending alerts of the outbox, only those of ``news_id`` if
+    given, until none is left. Returns the number of emails sent.
+
+    Each batch is claimed with ``FOR UPDATE SKIP LOCKED`` and marked in the
+    same transaction, so dispatchers never send the same row twice and the
+    batch of a dispatcher that dies is claimed again by the others. Only an
+    SMTP error in the middle of a batch can repeat its first messages.
+    A failed batch is left out until its retry delay is over (see
+    ``Notification.objects.mark_failed``). Without arguments it resumes
+    every pending alert, as the ``news-notification-retry`` schedule does.
+    """
+    from apps.news.models import New, Notification
+
+    batch_size = getattr(settings, "NEWS_EMAIL_BATCH_SIZE", 100)
+    titles = {}
+    sent = 0
+    with get_connection() as connection:
+        while True:
+            with transaction.atomic():
+                rows = Notification.objects.claim(batch_size, news_id)
+                if not rows:
+                    return sent
+                batches = {}
+                for pk, row_news_id, email in rows:
+                    batches.setdefault(row_news_id, []).append((pk, email))
+                if missing := batches.keys() - titles.keys():
+                    titles.update(
+                        New.all_objects.filter(pk__in=missing).values_list(
+                            "pk", "title"
+                        )
+                    )
+                for row_news_id, batch in batches.items():
+                    ids = [pk for pk, _ in batch]
+                    try:
+                        connection.open()
+                        sent += send_emails(
+                            subject="Notificação de nova notícia",
+                            body=f"Confira a nova notícia: {titles[row_news_id]}",
+                            recipients=[email for _, email in batch],
+                            batch_size=batch_size,
+                            connection=connection,
+                        )
+                    except (smtplib.SMTPException, OSError) as error:
+                        log.warning(
+                            f"Alert batch of news {row_news_id} failed: {error}"
+                        )
+                        Notification.objects.mark_failed(ids)
+                        # Reconnect on the next batch
+                        connection.close()
+                    else:
+                        Notification.objects.mark_sent(ids)
+
+
+def on_news_chunk_done(task):
+    """
+    Result hook of drain_notifications: retry failed dispatchers, record
+    progress and finish the fan-out after its last dispatcher.
+    """
+    from apps.news.models import NotificationFanout
+
+    kwargs = task.kwargs
+    if not task.success and kwargs["attempt"] < MAX_CHUNK_ATTEMPTS:
+        log.warning(
+            f"Alert dispatcher of fan-out {kwargs['fanout_id']} failed "
+            f"(attempt {kwargs['attempt']}): {task.result}"
         )
-        .filter(
-            user_type=User.READER,
+        dispatch_chunk(kwargs["fanout_id"], kwargs["news_id"], kwargs["attempt"] + 1)
+        return
+
+    with transaction.atomic():
+        fanout = NotificationFanout.objects.select_for_update().get(
+            pk=kwargs["fanout_id"]
         )
+        fanout.done_chunks += 1
+        if task.success:
+            fanout.sent += task.result
+        else:
+            fanout.failed_chunks += 1
+        fanout.save(update_fields=["done_chunks", "sent", "failed_chunks"])
+    if fanout.done_chunks == fanout.total_chunks:
+        finish_fanout(fanout)
+
+
+def finish_fanout(fanout):
+    """
+    Completion hook of a fan-out, runs once after its last dispatcher.
+    """
+    from apps.news.models import Notification
+
+    fanout.finished_at = timezone.now()
+    fanout.save(update_fields=["finished_at"])
+    failed = fanout.news.notifications.filter(status=Notification.FAILED).count()
+    log.info(
+        f"Alert sent to {fanout.sent} users about news article: {fanout.news.title} "
+        f"({failed} alerts failed, {fanout.failed_chunks} dispatchers failed)"
     )
-    if news.is_exclusive:
-        # Check if the user has the right subscription plan
-        users = users.filter(
-            subscription_plan__verticals__overlap=news.verticals,  # TODO VERIFY OVERLAP
-            subscription_plan__is_exclusive=True,
-        )
-    news.status = New.PUBLISHED
-    news.save()
-    # Notify all users about the new article
-    for user in users:
-        send_email(
-            subject="Notificação de nova notícia",
-            recipient_list=[user.email],
-            body=f"Confira a nova notícia: {news.title}",
+
+
+DIGEST_PERIODS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+}
+
+
+def get_digest_entitlements(frequency):
+    """
+    Group the plans of the readers preferring ``frequency`` by entitlement,
+    ``{vertical mask: plan ids}``: the verticals of an exclusive plan, none
+    for the other plans and for readers without plan (``None``).
+    """
+    from apps.account.models import User
+
+    plans = (
+        User.objects.filter(user_type=User.READER, notification_frequency=frequency)
+        .values_list(
+            "subscription_plan",
+            "subscription_plan__is_exclusive",
+            "subscription_plan__vertical_mask",
         )
-    log.info(f"Alert sent to all users about news article: {news.title}")
+        .order_by()
+        .distinct()
+    )
+    entitlements = {}
+    for plan_id, is_exclusive, vertical_mask in plans:
+        key = vertical_mask if is_exclusive else 0
+        entitlements.setdefault(key, []).append(plan_id)
+    return entitlements
+
+
+def get_digest_recipients(frequency, plan_ids):
+    from apps.account.models import User
+
+    plans = Q(subscription_plan__in=[pk for pk in plan_ids if pk is not None])
+    if None in plan_ids:
+        plans |= Q(subscription_plan__isnull=True)
+    return User.objects.filter(
+        plans, user_type=User.READER, notification_frequency=frequency
+    )
+
+
+def render_digest(articles):
+    """
+    Subject and body of the digest of ``articles``.
+    """
+    subject = f"Resumo de notícias: {len(articles)} novas"
+    items = [f"- {article.title}\n  {article.excerpt}" for article in articles]
+    return subject, "Confira as notícias publicadas:\n\n" + "\n\n".join(items)
+
+
+def send_digest(frequency=None):
+    """
+    Send the digest of the news published since the previous run to the
+    readers preferring ``frequency`` (hourly or daily). News are selected by
+    ``notified_at``, the time they were actually published, so drafts
+    scheduled in the past still enter the next digest.
+
+    Readers are grouped by entitlement (the verticals of their plan), so the
+    articles are selected and the email rendered once per entitlement, then
+    sent to every reader sharing it.
+    """
+    from apps.news.models import New, NotificationDigest
+
+    if frequency not in DIGEST_PERIODS:
+        log.warning(f"Unknown digest frequency: {frequency}")
+        return
+    until = timezone.now()
+    last = NotificationDigest.objects.filter(frequency=frequency).first()
+    since = last.until if last else until - DIGEST_PERIODS[frequency]
+    news = list(
+        New.objects.published()
+        .filter(notified_at__gte=since, notified_at__lt=until)
+        .only("title", "excerpt", "is_exclusive", "vertical_mask")
+    )
+
+    digests = sent = 0
+    if news:
+        for vertical_mask, plan_ids in get_digest_entitlements(frequency).items():
+            articles = [
+                article
+                for article in news
+                if not article.is_exclusive or vertical_mask & article.vertical_mask
+            ]
+            if not articles:
+                continue
+            subject, body = render_digest(articles)
+            recipients = get_digest_recipients(frequency, plan_ids)
+            digests += 1
+            sent += send_emails(
+                subject=subject,
+                body=body,
+                recipients=recipients.values_list("email", flat=True).iterator(),
+            )
+    NotificationDigest.objects.create(
+        frequency=frequency,
+        since=since,
+        until=until,
+        articles=len(news),
+        digests=digests,
+        sent=sent,
+    )
+    log.info(f"Sent {digests} {frequency} digests of {len(news)} news to {sent} users")
+    return sent
+
+
+def generate_picture_derivatives(news_id=None):
+    """
+    Render the resized WebP/AVIF versions of the picture of a news article.
+    """
+    from apps.news import cache as feed_cache
+    from apps.news import images
+    from apps.news.models import New
+
+    news = New.all_objects.filter(id=news_id).first()
+    if news is None or not news.picture:
+        log.warning(f"No picture to process for news ID: {news_id}")
+        return
+    derivatives = images.generate_derivatives(news.picture)
+    # A new updated_at changes the ETag and Last-Modified of the article.
+    # Blobs no longer referenced (replaced derivatives, or these ones if the
+    # picture was replaced meanwhile) are deleted by gc_pictures
+    updated = New.all_objects.filter(pk=news.pk, picture=news.picture.name).update(
+        picture_derivatives=derivatives, updated_at=timezone.now()
+    )
+    if not updated:
+        # The picture was replaced meanwhile, its own task takes over
+        return
+    feed_cache.invalidate_article(news)
+    log.info(f"Generated {len(derivatives)} picture derivatives for news: {news_id}")
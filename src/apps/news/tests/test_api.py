@@ -2,12 +2,33 @@
 Testes para a API de notícias
 """
 
+import csv
+import json
+from datetime import timedelta
+
 import pytest
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from django_q.models import Schedule
+from django.test.utils import CaptureQueriesContext
 
 from apps.news.models import New
-from apps.account.models import SubscriptionPlan
+from apps.account.models import User, SubscriptionPlan
+from apps.news.api.serializes import NewBulkListSerializer
+
+
+def bulk_item(picture, **kwargs):
+    """Item do payload de criação em lote"""
+    return {
+        "title": "Notícia em Lote",
+        "subtitle": "Subtítulo em lote",
+        "content": "<p>Conteúdo da notícia em lote</p>",
+        "picture": picture,
+        "verticals": [SubscriptionPlan.POWER],
+        **kwargs,
+    }
 
 
 @pytest.mark.django_db
@@ -213,3 +234,279 @@ class TestNewViewSet:
             status.HTTP_404_NOT_FOUND,
             status.HTTP_403_FORBIDDEN,
         ]
+
+    def test_full_text_search(
+        self, api_client, user_writer, published_news, draft_news
+    ):
+        """Testa a busca textual ordenada por relevância"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        response = api_client.get(url, {"q": "rascunho"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [str(draft_news.id)]
+
+    def test_full_text_search_ranking(self, api_client, user_writer):
+        """Testa que o título pesa mais que o conteúdo na busca"""
+        in_content = New.objects.create(
+            title="Economia",
+            subtitle="Mercado",
+            content="Reforma tributária avança",
+            author=user_writer,
+        )
+        in_title = New.objects.create(
+            title="Reforma tributária",
+            subtitle="Mercado",
+            content="Texto da notícia",
+            author=user_writer,
+        )
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        response = api_client.get(url, {"q": "tributária"})
+
+        assert [item["id"] for item in response.data["results"]] == [
+            str(in_title.id),
+            str(in_content.id),
+        ]
+
+    def test_list_omits_content(self, api_client, user_writer, published_news):
+        """Testa que a listagem não carrega nem retorna o conteúdo completo"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        item = response.data["results"][0]
+        assert "content" not in item
+        assert item["excerpt"] == published_news.content
+        assert not any(
+            '"news_new"."content"' in query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        )
+
+        detail_url = reverse("news-detail", kwargs={"pk": published_news.id})
+        response = api_client.get(detail_url)
+        assert response.data["content"] == published_news.content
+
+    def test_retrieve_conditional_get(
+        self,
+        api_client,
+        user_reader,
+        published_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa ETag e Last-Modified no detalhe da notícia"""
+        api_client.force_authenticate(user=user_reader)
+        url = reverse("news-detail", kwargs={"pk": published_news.id})
+
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+        assert "Accept" in response["Vary"]
+
+        published_news.title = "Título Novo"
+        with django_capture_on_commit_callbacks(execute=True):
+            published_news.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_conditional_get(
+        self,
+        api_client,
+        user_reader,
+        published_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa ETag na listagem, derivado das versões do plano"""
+        api_client.force_authenticate(user=user_reader)
+        url = reverse("news-list")
+
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert "Accept" in response["Vary"]
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "Accept" in response["Vary"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            published_news.delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 0
+
+    def test_sparse_fieldsets(self, api_client, user_writer, published_news):
+        """Testa ?fields= e ?omit= restringindo a resposta e o SELECT"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,title,published_at"})
+
+        assert set(response.data["results"][0]) == {"id", "title", "published_at"}
+        select = [q["sql"] for q in queries.captured_queries if "LIMIT" in q["sql"]]
+        assert '"news_new"."picture"' not in select[0]
+        assert '"news_new"."excerpt"' not in select[0]
+
+        detail_url = reverse("news-detail", kwargs={"pk": published_news.id})
+        response = api_client.get(detail_url, {"omit": "content,picture"})
+        assert "content" not in response.data
+        assert "picture" not in response.data
+        assert response.data["title"] == published_news.title
+
+    def test_export_ndjson(self, api_client, user_writer, published_news, draft_news):
+        """Testa a exportação em NDJSON com streaming"""
+        api_client.force_authenticate(user=user_writer)
+        response = api_client.get(reverse("news-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert {row["id"] for row in rows} == {
+            str(published_news.id),
+            str(draft_news.id),
+        }
+        assert rows[0]["content"]
+
+    def test_export_csv_honours_filters(
+        self, api_client, user_writer, published_news, draft_news
+    ):
+        """Testa a exportação em CSV respeitando os filtros"""
+        api_client.force_authenticate(user=user_writer)
+        response = api_client.get(
+            reverse("news-export"),
+            {"export_format": "csv", "verticals": SubscriptionPlan.POWER},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(published_news.id)
+        assert rows[0]["verticals"] == ",".join(published_news.verticals)
+
+    def test_export_invalid_format(self, api_client, user_writer):
+        """Testa formato de exportação inválido"""
+        api_client.force_authenticate(user=user_writer)
+        response = api_client.get(reverse("news-export"), {"export_format": "xml"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_as_reader(self, api_client, user_reader):
+        """Testa que leitores não podem exportar"""
+        api_client.force_authenticate(user=user_reader)
+        response = api_client.get(reverse("news-export"))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_create(self, api_client, user_writer, published_news):
+        """Testa a criação em lote com número constante de consultas"""
+        api_client.force_authenticate(user=user_writer)
+        picture = published_news.picture.name
+        payload = [bulk_item(picture, title=f"Lote {i}") for i in range(20)]
+        payload[0]["published_at"] = (timezone.now() + timedelta(hours=1)).isoformat()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse("news-bulk"), payload, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["results"]) == 20
+        assert response.data["errors"] == []
+        assert len(queries) < 10
+        news = New.objects.filter(title__startswith="Lote")
+        assert news.count() == 20
+        new = news.get(title="Lote 0")
+        assert new.author == user_writer
+        assert new.author_name == str(user_writer)
+        assert new.excerpt == "Conteúdo da notícia em lote"
+        assert new.search_vector
+        assert not Schedule.objects.exists()
+        assert not New.objects.due().filter(pk=new.pk).exists()
+
+    def test_bulk_create_rejects_invalid_batch(
+        self, api_client, user_writer, published_news
+    ):
+        """Testa que um item inválido rejeita o lote inteiro"""
+        api_client.force_authenticate(user=user_writer)
+        picture = published_news.picture.name
+        payload = [bulk_item(picture), bulk_item("news_pictures/inexistente.jpg")]
+
+        response = api_client.post(reverse("news-bulk"), payload, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "picture" in response.data[1]
+        assert not New.objects.filter(title="Notícia em Lote").exists()
+
+    def test_bulk_create_rejects_too_many_items(
+        self, api_client, user_writer, published_news, monkeypatch
+    ):
+        """Testa o limite de itens por requisição, mesmo com sucesso parcial"""
+        monkeypatch.setattr(NewBulkListSerializer, "MAX_ITEMS", 2)
+        api_client.force_authenticate(user=user_writer)
+        payload = [bulk_item(published_news.picture.name) for _ in range(3)]
+
+        response = api_client.post(
+            f"{reverse('news-bulk')}?partial_success=true", payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not New.objects.filter(title="Notícia em Lote").exists()
+
+    def test_bulk_create_partial_success(self, api_client, user_writer, published_news):
+        """Testa o lote com sucesso parcial e erros por item"""
+        api_client.force_authenticate(user=user_writer)
+        picture = published_news.picture.name
+        payload = [bulk_item(picture, title=""), bulk_item(picture)]
+
+        response = api_client.post(
+            f"{reverse('news-bulk')}?partial_success=true", payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["results"]) == 1
+        assert response.data["errors"][0]["index"] == 0
+        assert "title" in response.data["errors"][0]["errors"]
+        assert New.objects.filter(title="Notícia em Lote").count() == 1
+
+    def test_bulk_update(self, api_client, user_writer, published_news, draft_news):
+        """Testa a atualização em lote, inclusive de notícia de outro autor"""
+        other_writer = User.objects.create_user(
+            username="other_writer",
+            email="other@test.com",
+            password="testpass123",
+            user_type=User.WRITER,
+        )
+        api_client.force_authenticate(user=other_writer)
+        payload = [{"id": str(published_news.id), "title": "Título Novo"}]
+        response = api_client.patch(reverse("news-bulk"), payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        api_client.force_authenticate(user=user_writer)
+        payload = [
+            {"id": str(published_news.id), "content": "Novo conteúdo"},
+            {"id": str(draft_news.id), "title": "Rascunho Novo"},
+        ]
+        response = api_client.patch(reverse("news-bulk"), payload, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        published_news.refresh_from_db()
+        draft_news.refresh_from_db()
+        assert published_news.excerpt == "Novo conteúdo"
+        assert published_news.title == "Notícia Publicada"
+        assert draft_news.title == "Rascunho Novo"
+
+    def test_bulk_as_reader(self, api_client, user_reader):
+        """Testa que leitores não podem usar o endpoint em lote"""
+        api_client.force_authenticate(user=user_reader)
+        response = api_client.post(reverse("news-bulk"), [], format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,60 @@
+"""
+Testes para os endpoints assíncronos (ASGI) de notícias
+"""
+
+import pytest
+from django.test import AsyncClient
+from django.urls import reverse
+from asgiref.sync import async_to_sync
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def get(user, url, params=None):
+    """GET pelo handler ASGI com autenticação JWT"""
+    headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"} if user else {}
+    return async_to_sync(AsyncClient().get)(url, params or {}, headers=headers)
+
+
+@pytest.mark.django_db
+class TestNewAsyncViews:
+    """Testes para as views assíncronas de notícias"""
+
+    def test_list_requires_authentication(self):
+        """Testa listagem sem autenticação"""
+        response = get(None, reverse("news-async-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_list_respects_entitlement(
+        self, user_with_subscription, exclusive_news, published_news, draft_news
+    ):
+        """Testa que a listagem aplica as mesmas regras do NewViewSet"""
+        response = get(user_with_subscription, reverse("news-async-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = [item["id"] for item in response.json()["results"]]
+        assert ids == [str(exclusive_news.id)]
+
+    def test_list_filters_and_fields(self, user_writer, published_news, draft_news):
+        """Testa filtros e campos esparsos na listagem"""
+        response = get(
+            user_writer,
+            reverse("news-async-list"),
+            {"title": "Rascunho", "fields": "id,title"},
+        )
+
+        assert response.json()["results"] == [
+            {"id": str(draft_news.id), "title": draft_news.title}
+        ]
+
+    def test_retrieve(self, user_reader, published_news, draft_news):
+        """Testa o detalhe, inclusive a notícia não visível"""
+        url = reverse("news-async-detail", kwargs={"pk": published_news.id})
+        response = get(user_reader, url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["content"] == published_news.content
+
+        url = reverse("news-async-detail", kwargs={"pk": draft_news.id})
+        response = get(user_reader, url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
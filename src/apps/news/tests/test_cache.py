@@ -0,0 +1,289 @@
+"""
+Testes para o cache do feed de notícias por plano
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.core.cache import cache
+
+from apps.news import cache as feed_cache
+from apps.news.models import New
+from apps.account.models import User, SubscriptionPlan
+
+
+@pytest.mark.django_db
+class TestFeedCache:
+    """Testes para o cache do feed por plano"""
+
+    def test_user_scopes(self, user_reader, user_writer, user_with_subscription):
+        """Testa a normalização do plano do usuário em escopos"""
+        assert feed_cache.get_user_scopes(user_writer) == (feed_cache.WRITER_SCOPE,)
+        assert feed_cache.get_user_scopes(user_with_subscription) == (
+            "vertical:power",
+            "vertical:tax",
+        )
+        user_reader.subscription_plan = None
+        assert feed_cache.get_user_scopes(user_reader) == (feed_cache.PUBLIC_SCOPE,)
+
+    def test_article_scopes(self):
+        """Testa os escopos que enxergam uma notícia"""
+        draft = {"status": New.DRAFT, "is_exclusive": True, "verticals": ["tax"]}
+        public = {"status": New.PUBLISHED, "is_exclusive": False, "verticals": []}
+        exclusive = {
+            "status": New.PUBLISHED,
+            "is_exclusive": True,
+            "verticals": ["tax", "power"],
+        }
+
+        assert feed_cache.get_article_scopes(draft) == {feed_cache.WRITER_SCOPE}
+        assert feed_cache.get_article_scopes(public) == {
+            feed_cache.WRITER_SCOPE,
+            feed_cache.PUBLIC_SCOPE,
+        }
+        assert feed_cache.get_article_scopes(exclusive) == {
+            feed_cache.WRITER_SCOPE,
+            "vertical:tax",
+            "vertical:power",
+        }
+        assert feed_cache.get_article_scopes({"status": New.PUBLISHED}) is None
+
+    def test_plans_with_same_verticals_share_pages(
+        self, api_client, user_with_subscription, exclusive_news
+    ):
+        """Testa que usuários com os mesmos verticais compartilham o cache"""
+        plan = SubscriptionPlan.objects.create(
+            name="Plano Igual",
+            price=10,
+            is_exclusive=True,
+            verticals=[SubscriptionPlan.TAX, SubscriptionPlan.POWER],
+        )
+        other_reader = User.objects.create_user(
+            username="other_reader",
+            email="other_reader@test.com",
+            password="testpass123",
+            user_type=User.READER,
+            subscription_plan=plan,
+        )
+        url = reverse("news-list")
+
+        api_client.force_authenticate(user=user_with_subscription)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        api_client.force_authenticate(user=other_reader)
+        response_cached = api_client.get(url)
+        assert response_cached.data == response.data
+
+    def test_save_invalidates_feed(
+        self,
+        api_client,
+        user_with_subscription,
+        exclusive_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa que alterar uma notícia invalida o feed do plano"""
+        api_client.force_authenticate(user=user_with_subscription)
+        url = reverse("news-list")
+
+        response = api_client.get(url)
+        assert response.data["count"] == 1
+
+        exclusive_news.title = "Título Alterado"
+        with django_capture_on_commit_callbacks(execute=True):
+            exclusive_news.save()
+        response = api_client.get(url)
+        assert response.data["results"][0]["title"] == "Título Alterado"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            exclusive_news.delete()
+        response = api_client.get(url)
+        assert response.data["count"] == 0
+
+    def test_draft_change_keeps_reader_feed(
+        self, draft_news, django_capture_on_commit_callbacks
+    ):
+        """Testa que alterar um rascunho não invalida o feed dos leitores"""
+        keys = [
+            f"{feed_cache.FEED_VERSION_PREFIX}:{scope}"
+            for scope in (feed_cache.PUBLIC_SCOPE, feed_cache.WRITER_SCOPE)
+        ]
+        before = cache.get_many(keys)
+
+        draft_news.title = "Rascunho Alterado"
+        with django_capture_on_commit_callbacks(execute=True):
+            draft_news.save()
+
+        after = cache.get_many(keys)
+        assert after.get(keys[0]) == before.get(keys[0])
+        assert after[keys[1]] > before.get(keys[1], 0)
+
+    def test_invalidated_on_commit(
+        self, published_news, django_capture_on_commit_callbacks
+    ):
+        """Testa que as versões só mudam após o commit da transação"""
+        keys = [
+            feed_cache.ARTICLE_VERSION_KEY.format(published_news.pk),
+            f"{feed_cache.FEED_VERSION_PREFIX}:{feed_cache.PUBLIC_SCOPE}",
+        ]
+        before = feed_cache.get_versions(keys)
+
+        published_news.title = "Título Alterado"
+        with django_capture_on_commit_callbacks() as callbacks:
+            published_news.save()
+        assert cache.get_many(keys) == before
+
+        for callback in callbacks:
+            callback()
+        after = cache.get_many(keys)
+        assert all(after[key] > before[key] for key in keys)
+
+
+@pytest.mark.django_db
+class TestEmbargoVisibility:
+    """Testes da visibilidade por embargo (published_at já passou)"""
+
+    @pytest.fixture(autouse=True)
+    def embargo(self, settings):
+        settings.NEWS_EMBARGO_VISIBILITY = True
+
+    @pytest.fixture
+    def scheduled_news(self, draft_news):
+        """Rascunho agendado para daqui a uma hora"""
+        draft_news.published_at = timezone.now() + timedelta(hours=1)
+        draft_news.save()
+        return draft_news
+
+    def test_visible_once_published_at_passes(
+        self, api_client, user_reader, scheduled_news, monkeypatch
+    ):
+        """Testa que o rascunho aparece sem depender da tarefa de publicação"""
+        api_client.force_authenticate(user=user_reader)
+        url = reverse("news-list")
+        detail_url = reverse("news-detail", kwargs={"pk": scheduled_news.pk})
+
+        assert api_client.get(url).data["count"] == 0
+        assert api_client.get(detail_url).status_code == status.HTTP_404_NOT_FOUND
+
+        later = scheduled_news.published_at + timedelta(seconds=1)
+        monkeypatch.setattr(timezone, "now", lambda: later)
+        monkeypatch.setattr(time, "time", lambda: later.timestamp())
+
+        assert api_client.get(url).data["count"] == 1
+        assert api_client.get(detail_url).status_code == status.HTTP_200_OK
+        scheduled_news.refresh_from_db()
+        assert scheduled_news.status == New.DRAFT
+
+    def test_feed_timeout_aligned_to_next_embargo(self, scheduled_news, settings):
+        """Testa que o cache do feed expira na próxima publicação agendada"""
+        settings.NEWS_FEED_CACHE_TIMEOUT = 7200
+        next_embargo = feed_cache.get_next_embargo()
+
+        assert next_embargo == scheduled_news.published_at.timestamp()
+        assert 3590 <= feed_cache.get_feed_page_timeout() <= 3600
+
+    def test_scheduled_draft_change_invalidates_reader_feed(
+        self, scheduled_news, django_capture_on_commit_callbacks
+    ):
+        """Testa que alterar um rascunho agendado invalida o feed dos leitores"""
+        key = f"{feed_cache.FEED_VERSION_PREFIX}:{feed_cache.PUBLIC_SCOPE}"
+        before = cache.get(key, 0)
+
+        scheduled_news.title = "Agendada Alterada"
+        with django_capture_on_commit_callbacks(execute=True):
+            scheduled_news.save()
+
+        assert cache.get(key) > before
+
+
+@pytest.mark.django_db
+class TestArticleCache:
+    """Testes para o cache de leitura de uma notícia"""
+
+    def test_retrieve_served_from_cache(
+        self,
+        api_client,
+        user_with_subscription,
+        exclusive_news,
+        django_assert_num_queries,
+    ):
+        """Testa que a segunda leitura não consulta o banco"""
+        api_client.force_authenticate(user=user_with_subscription)
+        url = reverse("news-detail", kwargs={"pk": exclusive_news.id})
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        with django_assert_num_queries(0):
+            cached = api_client.get(url)
+        assert cached.data == response.data
+        assert cached.data["picture"].startswith("http://testserver/")
+
+    def test_entitlement_checked_per_user(
+        self, api_client, user_with_subscription, user_writer, exclusive_news
+    ):
+        """Testa que a permissão é verificada por usuário mesmo com cache"""
+        url = reverse("news-detail", kwargs={"pk": exclusive_news.id})
+        api_client.force_authenticate(user=user_with_subscription)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        other_reader = User.objects.create_user(
+            username="reader_sem_plano",
+            email="reader_sem_plano@test.com",
+            password="testpass123",
+            user_type=User.READER,
+        )
+        api_client.force_authenticate(user=other_reader)
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_save_and_delete_invalidate(
+        self,
+        api_client,
+        user_writer,
+        published_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa a invalidação ao salvar e ao deletar"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-detail", kwargs={"pk": published_news.id})
+        api_client.get(url)
+
+        published_news.title = "Título Alterado"
+        with django_capture_on_commit_callbacks(execute=True):
+            published_news.save()
+        assert api_client.get(url).data["title"] == "Título Alterado"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            published_news.delete()
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_single_flight(self, monkeypatch):
+        """Testa que apenas um worker reconstrói a entrada"""
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"meta": {}, "data": {"title": "x"}}
+
+        monkeypatch.setattr(feed_cache, "ARTICLE_LOCK_WAIT", 0.2)
+        cache.add(feed_cache.ARTICLE_LOCK_KEY.format("abc"), 1)
+        entry = feed_cache.get_article("abc", build)
+
+        # O lock estava ocupado: espera e então reconstrói por conta própria
+        assert entry["data"] == {"title": "x"}
+        assert len(calls) == 1
+
+        # Com a entrada válida, não reconstrói
+        cache.delete(feed_cache.ARTICLE_LOCK_KEY.format("abc"))
+        feed_cache.get_article("abc", build)
+        assert len(calls) == 1
+
+    def test_early_refresh(self):
+        """Testa a expiração antecipada probabilística"""
+        now = time.time()
+        assert feed_cache.should_refresh_early({"delta": 0.1, "expiry": now - 1})
+        assert not feed_cache.should_refresh_early({"delta": 0.0, "expiry": now + 60})
@@ -0,0 +1,134 @@
+"""
+Testes para as versões redimensionadas das imagens das notícias
+"""
+
+import io
+
+import pytest
+from PIL import Image
+from django.urls import reverse
+from rest_framework import status
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from apps.news import images
+from apps.news.models import New
+from apps.account.models import SubscriptionPlan
+
+
+def make_image(width, height, image_format="JPEG"):
+    image = Image.new("RGB", (width, height), color="blue")
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def large_image():
+    """Imagem em alta resolução"""
+    return SimpleUploadedFile(
+        "large.jpg", make_image(1600, 900), content_type="image/jpeg"
+    )
+
+
+class TestRender:
+    """Testes do redimensionamento (sem banco de dados)"""
+
+    def test_target_widths(self):
+        """Testa que as larguras nunca ampliam a imagem original"""
+        assert images.get_target_widths(1600) == [320, 640, 1280]
+        assert images.get_target_widths(800) == [320, 640, 800]
+        assert images.get_target_widths(100) == [100]
+
+    def test_render(self):
+        """Testa o redimensionamento mantendo a proporção"""
+        renders = images.render(make_image(1600, 900), 320, ["WEBP"])
+
+        assert len(renders) == 1
+        name, content, width, height = renders[0]
+        assert (name, width, height) == ("WEBP", 320, 180)
+        with Image.open(io.BytesIO(content)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (320, 180)
+
+
+@pytest.mark.django_db
+class TestPictureDerivatives:
+    """Testes da geração em segundo plano das versões redimensionadas"""
+
+    def create_news(self, user_writer, picture):
+        return New.objects.create(
+            title="Notícia com Imagem",
+            subtitle="Subtítulo",
+            content="Conteúdo",
+            picture=picture,
+            author=user_writer,
+            status=New.PUBLISHED,
+            verticals=[SubscriptionPlan.POWER],
+        )
+
+    def test_generated_on_commit(
+        self, user_writer, large_image, django_capture_on_commit_callbacks
+    ):
+        """Testa a geração das versões após o commit da transação"""
+        with django_capture_on_commit_callbacks(execute=True):
+            news = self.create_news(user_writer, large_image)
+        saved_at = news.updated_at
+        news.refresh_from_db()
+
+        # Nova versão do artigo para ETag/Last-Modified
+        assert news.updated_at > saved_at
+        formats = images.get_formats()
+        assert len(news.picture_derivatives) == 3 * len(formats)
+        assert {d["width"] for d in news.picture_derivatives} == {320, 640, 1280}
+        storage = news.picture.storage
+        assert all(storage.exists(d["name"]) for d in news.picture_derivatives)
+
+    def test_picture_change_replaces_derivatives(
+        self, user_writer, large_image, sample_image, django_capture_on_commit_callbacks
+    ):
+        """Testa que trocar a imagem substitui as versões antigas"""
+        with django_capture_on_commit_callbacks(execute=True):
+            news = self.create_news(user_writer, large_image)
+        news.refresh_from_db()
+        old_names = [d["name"] for d in news.picture_derivatives]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            news.picture = sample_image
+            news.save()
+        news.refresh_from_db()
+
+        assert {d["width"] for d in news.picture_derivatives} == {100}
+        # Old blobs are left to gc_pictures, they may be shared
+        assert not set(old_names) & {d["name"] for d in news.picture_derivatives}
+
+    def test_unchanged_picture_is_not_processed(
+        self, user_writer, large_image, django_capture_on_commit_callbacks
+    ):
+        """Testa que salvar sem trocar a imagem não gera novas versões"""
+        with django_capture_on_commit_callbacks(execute=True):
+            news = self.create_news(user_writer, large_image)
+        news = New.objects.get(pk=news.pk)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            news.title = "Outro Título"
+            news.save()
+
+        assert callbacks == []
+        assert news.picture_derivatives
+
+    def test_api_exposes_derivatives(
+        self, api_client, user_writer, large_image, django_capture_on_commit_callbacks
+    ):
+        """Testa as URLs e dimensões das versões na API"""
+        with django_capture_on_commit_callbacks(execute=True):
+            news = self.create_news(user_writer, large_image)
+        api_client.force_authenticate(user=user_writer)
+
+        response = api_client.get(reverse("news-detail", kwargs={"pk": news.id}))
+        assert response.status_code == status.HTTP_200_OK
+        derivative = response.data["picture_derivatives"][0]
+        assert derivative["url"].startswith("http://testserver/")
+        assert {"width", "height", "format"} <= set(derivative)
+
+        response = api_client.get(reverse("news-list"))
+        assert response.data["results"][0]["picture_derivatives"]
@@ -0,0 +1,175 @@
+"""
+Testes para o comando import_news
+"""
+
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from django_q.models import Schedule
+from django.core.management import call_command
+from django.contrib.postgres.search import SearchQuery
+
+from apps.news import tasks
+from apps.news.models import SEARCH_CONFIG, New
+from apps.account.models import SubscriptionPlan
+
+
+def write_jsonl(path, rows):
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    return path
+
+
+def news_row(i, **kwargs):
+    """Linha de notícia histórica"""
+    return {
+        "id": f"cms-{i}",
+        "title": f"Notícia Histórica {i}",
+        "subtitle": f"Subtítulo {i}",
+        "content": f"<p>Conteúdo da notícia {i}</p>",
+        "picture": f"news_pictures/{i}.jpg",
+        "status": New.PUBLISHED,
+        "published_at": "2020-01-01T10:00:00Z",
+        "verticals": [SubscriptionPlan.POWER],
+        **kwargs,
+    }
+
+
+def import_news(path, *args):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command("import_news", str(path), *args, stdout=stdout, stderr=stderr)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportNews:
+    """Testes para a importação em massa de notícias"""
+
+    @pytest.mark.parametrize("copy_args", [[], ["--no-copy"]])
+    def test_import_jsonl(self, tmp_path, user_writer, copy_args):
+        """Testa a importação via COPY e via bulk_create"""
+        path = write_jsonl(tmp_path / "news.jsonl", [news_row(i) for i in range(5)])
+
+        stdout, _ = import_news(
+            path, "--author", user_writer.username, "--batch-size", "2", *copy_args
+        )
+
+        assert "5 created" in stdout
+        assert New.objects.count() == 5
+        new = New.objects.get(title="Notícia Histórica 0")
+        assert new.author == user_writer
+        assert new.author_name == str(user_writer)
+        assert new.excerpt == "Conteúdo da notícia 0"
+        assert new.verticals == [SubscriptionPlan.POWER]
+        query = SearchQuery("histórica", config=SEARCH_CONFIG)
+        assert New.objects.filter(search_vector=query).count() == 5
+        assert not (tmp_path / "news.jsonl.checkpoint").exists()
+
+    @pytest.mark.parametrize("copy_args", [[], ["--no-copy"]])
+    def test_reimport_upserts(self, tmp_path, user_writer, copy_args):
+        """Testa que reimportar o arquivo atualiza em vez de duplicar"""
+        path = write_jsonl(tmp_path / "news.jsonl", [news_row(1)])
+        import_news(path, "--author", user_writer.username, *copy_args)
+        write_jsonl(path, [news_row(1, title="Título Corrigido")])
+
+        stdout, _ = import_news(path, "--author", user_writer.username, *copy_args)
+
+        assert "0 created, 1 updated" in stdout
+        assert New.objects.get().title == "Título Corrigido"
+
+    @pytest.mark.parametrize("copy_args", [[], ["--no-copy"]])
+    def test_null_marker_text(self, tmp_path, user_writer, copy_args):
+        """Testa que um texto igual ao marcador de nulo do COPY é mantido"""
+        rows = [news_row(1, subtitle="\\N"), news_row(2, published_at=None)]
+        path = write_jsonl(tmp_path / "news.jsonl", rows)
+
+        stdout, _ = import_news(path, "--author", user_writer.username, *copy_args)
+
+        assert "2 created" in stdout
+        assert New.objects.get(title="Notícia Histórica 1").subtitle == "\\N"
+        assert New.objects.get(title="Notícia Histórica 2").published_at is None
+
+    def test_import_csv(self, tmp_path, user_writer):
+        """Testa a importação de CSV com coluna de autor"""
+        path = tmp_path / "news.csv"
+        path.write_text(
+            "title,subtitle,content,picture,author,is_exclusive,verticals\n"
+            f"Notícia CSV,Subtítulo,Conteúdo,news_pictures/a.jpg,"
+            f'{user_writer.username},sim,"power,tax"\n',
+            encoding="utf-8",
+        )
+
+        import_news(path)
+
+        new = New.objects.get()
+        assert new.is_exclusive is True
+        assert new.status == New.DRAFT
+        assert new.verticals == [SubscriptionPlan.POWER, SubscriptionPlan.TAX]
+
+    def test_invalid_rows_are_reported(self, tmp_path, user_writer):
+        """Testa que linhas inválidas são rejeitadas sem abortar a importação"""
+        rows = [
+            news_row(1, verticals=["sports"]),
+            news_row(2, title=""),
+            news_row(3),
+            news_row(4, published_at=1577872800),
+            news_row(5, status=["published"]),
+            news_row(6, title=123),
+            news_row(7, picture={"a": 1}),
+        ]
+        path = write_jsonl(tmp_path / "news.jsonl", rows)
+
+        stdout, stderr = import_news(path, "--author", user_writer.username)
+
+        assert "6 rows rejected" in stdout
+        assert "Row 1: invalid verticals ['sports']" in stderr
+        assert "Row 2: title is required" in stderr
+        assert "Row 4: invalid datetime 1577872800" in stderr
+        assert "Row 5: " in stderr
+        assert "Row 6: title must be a string" in stderr
+        assert "Row 7: picture must be a string" in stderr
+        assert New.objects.get().title == "Notícia Histórica 3"
+
+    def test_resume(self, tmp_path, user_writer):
+        """Testa a retomada a partir do checkpoint"""
+        path = write_jsonl(tmp_path / "news.jsonl", [news_row(i) for i in range(4)])
+        (tmp_path / "news.jsonl.checkpoint").write_text("3")
+
+        stdout, _ = import_news(path, "--author", user_writer.username, "--resume")
+
+        assert "Resuming after row 3" in stdout
+        assert New.objects.get().title == "Notícia Histórica 3"
+
+    def test_scheduled_drafts(self, tmp_path, user_writer):
+        """Testa que rascunhos futuros entram na fila de publicação"""
+        published_at = timezone.now() + timedelta(days=1)
+        row = news_row(1, status=New.DRAFT, published_at=published_at.isoformat())
+        path = write_jsonl(tmp_path / "news.jsonl", [row])
+
+        import_news(path, "--author", user_writer.username)
+
+        assert not Schedule.objects.exists()
+        assert not New.objects.due().exists()
+        assert New.objects.due(published_at).get().title == "Notícia Histórica 1"
+
+    @pytest.mark.parametrize("copy_args", [[], ["--no-copy"]])
+    def test_skip_notifications(
+        self, tmp_path, user_writer, user_reader, mailoutbox, copy_args
+    ):
+        """Testa que rascunhos retroativos são publicados sem alertas"""
+        rows = [news_row(i, status=New.DRAFT) for i in range(2)]
+        path = write_jsonl(tmp_path / "news.jsonl", rows)
+
+        import_news(
+            path, "--author", user_writer.username, "--skip-notifications", *copy_args
+        )
+
+        assert not New.objects.filter(notify=True).exists()
+        assert tasks.publish_due_news() == 2
+        assert New.objects.filter(status=New.PUBLISHED).count() == 2
+        assert mailoutbox == []
+
+        import_news(path, "--author", user_writer.username, *copy_args)
+        assert New.objects.filter(notify=True).count() == 2
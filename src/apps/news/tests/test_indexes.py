@@ -0,0 +1,133 @@
+"""
+Testes de regressão dos planos de execução (EXPLAIN) das consultas de notícias
+"""
+
+import random
+from types import SimpleNamespace
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.http import QueryDict
+from django.utils import timezone
+
+from apps.news.models import New
+from apps.account.models import SubscriptionPlan
+from apps.news.api.views import NewViewSet
+from apps.news.api.filters import NewFilter
+from apps.news.api.pagination import NewCursorPagination
+
+SEED_SIZE = 20000
+PAGE_SIZE = 10
+VERTICALS = [vertical for vertical, _ in SubscriptionPlan.VERTICAL_CHOICES]
+
+
+@pytest.fixture
+def seeded_news(user_writer):
+    """Base de notícias com volume e distribuição realistas"""
+    rnd = random.Random(42)
+    now = timezone.now()
+    news_list = []
+    for i in range(SEED_SIZE):
+        is_draft = rnd.random() < 0.05
+        news_list.append(
+            New(
+                title=f"Notícia {i}",
+                subtitle=f"Subtítulo {i}",
+                content="Conteúdo " * 50,
+                author=user_writer,
+                status=New.DRAFT if is_draft else New.PUBLISHED,
+                is_exclusive=rnd.random() < 0.5,
+                published_at=None if is_draft else now - timedelta(minutes=30 * i),
+                verticals=rnd.sample(VERTICALS, rnd.randint(1, 2)),
+                deleted=now if rnd.random() < 0.02 else None,
+            )
+        )
+    New.all_objects.bulk_create(news_list, batch_size=2000)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {New._meta.db_table}")
+
+
+def get_feed(user, params=None):
+    """Queryset do feed exatamente como o NewViewSet o monta"""
+    request = SimpleNamespace(user=user, method="GET", query_params=QueryDict())
+    view = NewViewSet(request=request, action="list", format_kwarg=None)
+    queryset = view.get_queryset()
+    if params:
+        queryset = NewFilter(params, queryset=queryset).qs
+    return queryset
+
+
+def assert_no_seq_scan(queryset):
+    plan = queryset.explain()
+    assert f"Seq Scan on {New._meta.db_table}" not in plan, plan
+    return plan
+
+
+def assert_index_cond(queryset, condition):
+    """O índice busca pela condição, em vez de apenas filtrar as linhas"""
+    plan = assert_no_seq_scan(queryset)
+    index_conds = [
+        line for line in plan.splitlines() if line.strip().startswith("Index Cond:")
+    ]
+    assert any(condition in line for line in index_conds), plan
+
+
+@pytest.mark.slow
+@pytest.mark.performance
+@pytest.mark.django_db
+class TestReadPathIndexes:
+    """Garante que as consultas canônicas usam índices"""
+
+    def test_writer_feed(self, seeded_news, user_writer):
+        """Testa o feed do escritor (todas as notícias)"""
+        assert_no_seq_scan(get_feed(user_writer)[:PAGE_SIZE])
+
+    def test_public_feed(self, seeded_news, user_reader):
+        """Testa o feed do leitor sem plano"""
+        assert_no_seq_scan(get_feed(user_reader)[:PAGE_SIZE])
+
+    def test_plan_feed(self, seeded_news, user_with_subscription):
+        """Testa o feed do leitor com plano (overlap de verticais)"""
+        assert_no_seq_scan(get_feed(user_with_subscription)[:PAGE_SIZE])
+
+    def test_embargo_public_feed(self, seeded_news, user_reader, settings):
+        """Testa o feed do leitor com visibilidade por embargo"""
+        settings.NEWS_EMBARGO_VISIBILITY = True
+        assert_no_seq_scan(get_feed(user_reader)[:PAGE_SIZE])
+
+    def test_due_drafts(self, seeded_news):
+        """Testa a fila de rascunhos agendados do publicador"""
+        assert_no_seq_scan(New.objects.due().order_by("published_at")[:500])
+
+    def test_cursor_page(self, seeded_news, user_reader):
+        """Testa uma página profunda da paginação por cursor"""
+        paginator = NewCursorPagination()
+        paginator.field, paginator.field_name, paginator.descending = (
+            "-published_at",
+            "published_at",
+            True,
+        )
+        queryset = get_feed(user_reader)
+        middle = queryset.order_by("-published_at")[SEED_SIZE // 4]
+        queryset = queryset.order_by(*paginator.get_order_by()).filter(
+            paginator.get_keyset_filter(middle.published_at, middle.pk)
+        )
+        assert_index_cond(queryset[: PAGE_SIZE + 1], "published_at <=")
+
+    def test_verticals_filter(self, seeded_news, user_writer):
+        """Testa o filtro de verticais"""
+        assert_no_seq_scan(get_feed(user_writer, {"verticals": "labor"})[:PAGE_SIZE])
+
+    def test_published_at_range_filter(self, seeded_news, user_writer):
+        """Testa o filtro por intervalo de publicação"""
+        end = timezone.localdate() - timedelta(days=30)
+        params = {
+            "published_at_after": (end - timedelta(days=7)).isoformat(),
+            "published_at_before": end.isoformat(),
+        }
+        assert_no_seq_scan(get_feed(user_writer, params))
+
+    def test_full_text_search(self, seeded_news, user_writer):
+        """Testa a busca textual"""
+        assert_no_seq_scan(get_feed(user_writer, {"q": "economia"})[:PAGE_SIZE])
@@ -3,8 +3,13 @@ Testes para o modelo New
 """
 
 import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from django.test.utils import CaptureQueriesContext
 
 from apps.news.models import New
+from apps.account.fields import get_vertical_mask
 from apps.account.models import SubscriptionPlan
 
 
@@ -192,3 +197,81 @@ class TestNew:
         # Verifica que foi soft delete
         assert New.objects.filter(id=news_id).count() == 0
         assert New.all_objects.filter(id=news_id).count() == 1
+
+    def test_news_excerpt(self, user_writer):
+        """Testa o resumo em texto plano gerado a partir do conteúdo"""
+        news = New.objects.create(
+            title="Notícia Longa",
+            subtitle="Subtítulo",
+            content="<p>" + "palavra " * 100 + "</p>",
+            author=user_writer,
+        )
+
+        assert len(news.excerpt) <= New.EXCERPT_LENGTH
+        assert news.excerpt.startswith("palavra palavra")
+        assert "<p>" not in news.excerpt
+
+    def test_news_author_name(
+        self,
+        api_client,
+        user_writer,
+        published_news,
+        django_capture_on_commit_callbacks,
+    ):
+        """Testa a cópia do nome do autor e a invalidação dos caches"""
+        assert published_news.author_name == str(user_writer)
+        api_client.force_authenticate(user=user_writer)
+        list_url = reverse("news-list")
+        detail_url = reverse("news-detail", kwargs={"pk": published_news.id})
+        list_etag = api_client.get(list_url)["ETag"]
+        detail_etag = api_client.get(detail_url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_writer.save(update_fields=["last_login"])
+        assert (
+            api_client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code
+            == status.HTTP_304_NOT_MODIFIED
+        )
+
+        user_writer.email = "novo@test.com"
+        with django_capture_on_commit_callbacks(execute=True):
+            user_writer.save()
+
+        published_news.refresh_from_db()
+        assert published_news.author_name == "novo@test.com"
+        response = api_client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["author_name"] == "novo@test.com"
+        response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["author_name"] == "novo@test.com"
+
+    def test_news_vertical_mask_overlap(self, user_writer):
+        """Testa o lookup de interseção de verticais pela máscara de bits"""
+        news = New.objects.create(
+            title="Notícia Mascarada",
+            subtitle="Subtítulo",
+            content="Conteúdo",
+            author=user_writer,
+            verticals=[SubscriptionPlan.HEALTH, SubscriptionPlan.ENERGY],
+        )
+        health = get_vertical_mask([SubscriptionPlan.HEALTH, SubscriptionPlan.TAX])
+        labor = get_vertical_mask([SubscriptionPlan.LABOR])
+
+        assert news.vertical_mask == get_vertical_mask(news.verticals)
+        assert New.objects.filter(vertical_mask__overlap=health).get() == news
+        assert not New.objects.filter(vertical_mask__overlap=labor).exists()
+        assert not New.objects.filter(vertical_mask__overlap=0).exists()
+
+    def test_bulk_save_status_skips_derived_fields(self, published_news, draft_news):
+        """Testa que mudar só o status em lote não consulta os autores"""
+        news = list(New.objects.all())
+        for new in news:
+            new.status = New.PUBLISHED
+
+        with CaptureQueriesContext(connection) as queries:
+            New.objects.bulk_save(news, fields=["status"])
+
+        assert not [q for q in queries if "account_user" in q["sql"]]
+
+        assert New.objects.filter(status=New.PUBLISHED).count() == 2
@@ -0,0 +1,105 @@
+"""
+Testes para a paginação por cursor da API de notícias
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from django.test.utils import CaptureQueriesContext
+
+from apps.news.models import New
+from apps.account.models import SubscriptionPlan
+
+
+@pytest.fixture
+def many_news(user_writer):
+    """Notícias publicadas com datas repetidas e rascunhos sem data"""
+    now = timezone.now()
+    news_list = []
+    for i in range(25):
+        news_list.append(
+            New(
+                title=f"Notícia Cursor {i:02d}",
+                subtitle=f"Sub {i}",
+                content=f"Conteúdo {i}",
+                author=user_writer,
+                status=New.PUBLISHED if i < 20 else New.DRAFT,
+                published_at=now - timedelta(hours=i // 3) if i < 20 else None,
+                verticals=[SubscriptionPlan.POWER],
+            )
+        )
+    return New.objects.bulk_create(news_list)
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    """Testes para a paginação por cursor"""
+
+    def walk(self, api_client, params):
+        url = reverse("news-list")
+        response = api_client.get(url, {"pagination": "cursor", **params})
+        ids = []
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            ids.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = api_client.get(response.data["next"])
+
+    def test_walk_all_pages(self, api_client, user_writer, many_news):
+        """Testa que as páginas cobrem todas as notícias sem repetições"""
+        api_client.force_authenticate(user=user_writer)
+
+        ids = self.walk(api_client, {})
+
+        assert len(ids) == len(set(ids)) == 25
+        expected = sorted(
+            many_news,
+            key=lambda news: (news.published_at is None, news.published_at, news.id),
+            reverse=True,
+        )
+        assert ids == [str(news.id) for news in expected]
+
+    def test_walk_with_ordering_and_filter(self, api_client, user_writer, many_news):
+        """Testa o cursor junto com ordenação e filtros"""
+        api_client.force_authenticate(user=user_writer)
+
+        ids = self.walk(api_client, {"ordering": "title", "title": "Cursor 1"})
+
+        titles = [New.objects.get(id=news_id).title for news_id in ids]
+        assert titles == sorted(
+            news.title for news in many_news if "Cursor 1" in news.title
+        )
+
+    def test_no_count_query(self, api_client, user_writer, many_news):
+        """Testa que a paginação por cursor não executa COUNT"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"pagination": "cursor"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+    def test_invalid_cursor(self, api_client, user_writer, many_news):
+        """Testa cursor inválido"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-list")
+
+        response = api_client.get(url, {"cursor": "invalido"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_page_number_is_default(self, api_client, user_writer, many_news):
+        """Testa que a paginação por página continua sendo o padrão"""
+        api_client.force_authenticate(user=user_writer)
+
+        response = api_client.get(reverse("news-list"))
+
+        assert response.data["count"] == 25
@@ -6,9 +6,11 @@ import pytest
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
 
 from apps.news.models import New
 from apps.account.models import User, SubscriptionPlan
+from apps.news.api.pagination import NewCursorPagination
 
 
 @pytest.mark.slow
@@ -151,7 +153,55 @@ class TestPerformance:
         api_client.force_authenticate(user=user_writer)
         list_url = reverse("news-list")
 
-        # Verificar número de queries na listagem (ajustado para realidade)
-        with django_assert_num_queries(5):  # Count + Select + Author lookups
+        # Verificar número de queries na listagem
+        with django_assert_num_queries(2):  # Count + Select
             response = api_client.get(list_url)
             assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("page_size", [10, 50, 100])
+    @pytest.mark.parametrize(
+        "pagination, expected_queries",
+        [("page", 2), ("cursor", 1)],  # Count + Select / Select
+    )
+    def test_list_query_budget(
+        self,
+        api_client,
+        user_writer,
+        monkeypatch,
+        django_assert_num_queries,
+        page_size,
+        pagination,
+        expected_queries,
+    ):
+        """Testa que a listagem faz um número constante de queries"""
+        writers = [user_writer] + [
+            User.objects.create_user(
+                username=f"writer_budget_{i}",
+                email=f"writer_budget_{i}@test.com",
+                password="test123",
+                user_type=User.WRITER,
+            )
+            for i in range(4)
+        ]
+        for i in range(page_size):
+            New.objects.create(
+                title=f"Notícia Budget {i}",
+                subtitle=f"Sub {i}",
+                content=f"Conteúdo {i}",
+                author=writers[i % len(writers)],
+                status=New.PUBLISHED,
+            )
+        monkeypatch.setattr(PageNumberPagination, "page_size", page_size)
+        monkeypatch.setattr(NewCursorPagination, "page_size", page_size)
+
+        api_client.force_authenticate(user=user_writer)
+        list_url = reverse("news-list")
+
+        with django_assert_num_queries(expected_queries):
+            response = api_client.get(list_url, {"pagination": pagination})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == page_size
+        assert {item["author_name"] for item in response.data["results"]} == {
+            writer.email for writer in writers
+        }
@@ -0,0 +1,89 @@
+"""
+Testes para o renderer/parser JSON e a compressão das respostas
+"""
+
+import io
+import gzip
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.news.models import New
+from setting.renderers import ORJSONParser, ORJSONRenderer
+from setting.middlewares import brotli
+
+
+class TestORJSONRenderer:
+    """Testes para o renderer e o parser baseados em orjson"""
+
+    def test_same_output_as_drf(self):
+        """Testa que UUID, datetime e Decimal saem como no JSONRenderer"""
+        data = {
+            "id": uuid.uuid4(),
+            "published_at": timezone.now(),
+            "price": Decimal("29.99"),
+            "verticals": ["power", "tax"],
+        }
+
+        rendered = ORJSONRenderer().render(data)
+
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+
+    def test_parse(self):
+        """Testa o parser"""
+        stream = io.BytesIO(b'{"title": "Not\\u00edcia", "verticals": ["tax"]}')
+
+        assert ORJSONParser().parse(stream) == {
+            "title": "Notícia",
+            "verticals": ["tax"],
+        }
+
+
+@pytest.mark.django_db
+class TestCompression:
+    """Testes para a compressão negociada das respostas"""
+
+    @pytest.fixture
+    def big_news(self, user_writer):
+        return New.objects.create(
+            title="Notícia Grande",
+            subtitle="Subtítulo",
+            content="Conteúdo longo da notícia. " * 200,
+            author=user_writer,
+            status=New.PUBLISHED,
+        )
+
+    def test_gzip(self, api_client, user_writer, big_news):
+        """Testa a compressão gzip"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-detail", kwargs={"pk": big_news.id})
+
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["ETag"].startswith('W/"')
+        assert json.loads(gzip.decompress(response.content))["id"] == str(big_news.id)
+
+    @pytest.mark.skipif(brotli is None, reason="Brotli não instalado")
+    def test_brotli_preferred(self, api_client, user_writer, big_news):
+        """Testa que brotli é preferido quando aceito"""
+        api_client.force_authenticate(user=user_writer)
+        url = reverse("news-detail", kwargs={"pk": big_news.id})
+
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        assert response["Content-Encoding"] == "br"
+        assert json.loads(brotli.decompress(response.content))["id"] == str(big_news.id)
+
+    def test_small_response_not_compressed(self, api_client, user_writer):
+        """Testa que respostas pequenas não são comprimidas"""
+        api_client.force_authenticate(user=user_writer)
+
+        response = api_client.get(reverse("news-list"), HTTP_ACCEPT_ENCODING="gzip, br")
+
+        assert not response.has_header("Content-Encoding")
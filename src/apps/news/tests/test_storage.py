@@ -0,0 +1,124 @@
+"""
+Testes para o armazenamento das imagens por conteúdo (deduplicado)
+"""
+
+import io
+import os
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from apps.news.models import New
+from apps.news.storage import ContentAddressedStorage
+from apps.account.models import SubscriptionPlan
+
+
+@pytest.fixture
+def storage(tmp_path, settings):
+    """Armazenamento isolado em um diretório temporário"""
+    settings.MEDIA_ROOT = str(tmp_path)
+    return New._meta.get_field("picture").storage
+
+
+def age(storage, name, seconds=7200):
+    """Envelhece um blob para que a coleta de lixo o considere"""
+    path = storage.path(name)
+    mtime = os.stat(path).st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+class TestContentAddressedStorage:
+    """Testes do armazenamento (sem banco de dados)"""
+
+    def test_name_is_content_digest(self, tmp_path):
+        """Testa que o nome do arquivo é o hash do conteúdo"""
+        storage = ContentAddressedStorage(location=tmp_path)
+        digest = hashlib.sha256(b"foto").hexdigest()
+
+        name = storage.save("news_pictures/Foto.JPG", ContentFile(b"foto"))
+
+        assert name == f"news_pictures/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+        with storage.open(name) as file:
+            assert file.read() == b"foto"
+
+    def test_identical_uploads_are_stored_once(self, tmp_path):
+        """Testa que o mesmo conteúdo é gravado uma única vez"""
+        storage = ContentAddressedStorage(location=tmp_path)
+
+        first = storage.save("news_pictures/a.jpg", ContentFile(b"foto"))
+        second = storage.save("news_pictures/b.jpg", io.BytesIO(b"foto"))
+        other = storage.save("news_pictures/c.jpg", ContentFile(b"outra"))
+
+        assert first == second
+        assert other != first
+        files = [f for _, _, names in os.walk(tmp_path) for f in names]
+        assert len(files) == 2
+
+    def test_blob_purged_during_save_is_written_again(self, tmp_path, monkeypatch):
+        """Testa que um blob removido pela coleta durante o save é regravado"""
+        storage = ContentAddressedStorage(location=tmp_path)
+        # O blob some entre exists() e a atualização da data de modificação
+        monkeypatch.setattr(storage, "exists", lambda name: True)
+
+        name = storage.save("news_pictures/a.jpg", ContentFile(b"foto"))
+
+        with storage.open(name) as file:
+            assert file.read() == b"foto"
+
+    def test_delete_keeps_shared_blob(self, tmp_path):
+        """Testa que delete não remove blobs possivelmente compartilhados"""
+        storage = ContentAddressedStorage(location=tmp_path)
+        name = storage.save("news_pictures/a.jpg", ContentFile(b"foto"))
+
+        storage.delete(name)
+
+        assert storage.exists(name)
+
+
+@pytest.mark.django_db
+class TestGarbageCollection:
+    """Testes do comando gc_pictures"""
+
+    def test_collects_unreferenced_blobs(self, storage, user_writer, sample_image):
+        """Testa que só blobs antigos e sem referência são removidos"""
+        news = New.objects.create(
+            title="Notícia",
+            subtitle="Subtítulo",
+            content="Conteúdo",
+            picture=sample_image,
+            author=user_writer,
+            verticals=[SubscriptionPlan.POWER],
+        )
+        orphan = storage.save("news_pictures/orfa.jpg", ContentFile(b"orfa"))
+        recent = storage.save("news_pictures/nova.jpg", ContentFile(b"nova"))
+        age(storage, news.picture.name)
+        age(storage, orphan)
+
+        stdout = io.StringIO()
+        call_command("gc_pictures", "--dry-run", stdout=stdout)
+        assert f"Would delete {orphan}" in stdout.getvalue()
+        assert storage.exists(orphan)
+
+        call_command("gc_pictures", stdout=io.StringIO())
+        assert not storage.exists(orphan)
+        assert storage.exists(recent)
+        assert storage.exists(news.picture.name)
+
+    def test_keeps_blobs_of_soft_deleted_news(self, storage, user_writer, sample_image):
+        """Testa que notícias excluídas logicamente mantêm suas imagens"""
+        news = New.objects.create(
+            title="Notícia",
+            subtitle="Subtítulo",
+            content="Conteúdo",
+            picture=sample_image,
+            author=user_writer,
+            verticals=[SubscriptionPlan.POWER],
+        )
+        news.delete()
+        age(storage, news.picture.name)
+
+        call_command("gc_pictures", stdout=io.StringIO())
+
+        assert storage.exists(news.picture.name)
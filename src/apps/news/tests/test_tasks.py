@@ -0,0 +1,467 @@
+"""
+Testes para as tarefas de publicação e envio de alertas
+"""
+
+import io
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from django_q.models import Schedule
+from django.core.mail import get_connection
+from django.core.management import call_command
+
+from apps.news import tasks
+from apps.news.models import (
+    New,
+    Audience,
+    Notification,
+    NotificationDigest,
+    NotificationFanout,
+)
+from apps.account.models import User, SubscriptionPlan
+from apps.news.management.commands.benchmark_email import SMTPSink
+
+
+@pytest.fixture
+def readers():
+    """Leitores sem plano de assinatura"""
+    return [
+        User.objects.create_user(
+            username=f"reader_{i}",
+            email=f"reader_{i}@test.com",
+            password="testpass123",
+            user_type=User.READER,
+        )
+        for i in range(5)
+    ]
+
+
+def get_recipients(outbox):
+    return sorted(email for message in outbox for email in message.to)
+
+
+@pytest.fixture
+def chunk_size(settings):
+    settings.NEWS_NOTIFICATION_CHUNK_SIZE = 2
+    return 2
+
+
+@pytest.mark.django_db
+class TestPublishNews:
+    """Testes do envio de alertas em lotes paralelos"""
+
+    def test_publish_news(self, draft_news, readers, mailoutbox, chunk_size):
+        """Testa que cada leitor recebe um único alerta"""
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        draft_news.refresh_from_db()
+        assert draft_news.status == New.PUBLISHED
+        assert get_recipients(mailoutbox) == sorted(r.email for r in readers)
+        assert draft_news.title in mailoutbox[0].body
+        fanout = NotificationFanout.objects.get(news=draft_news)
+        assert fanout.total_chunks == 3
+        assert fanout.done_chunks == 3
+        assert fanout.sent == 5
+        assert fanout.progress == 1.0
+        assert fanout.finished_at is not None
+        notifications = Notification.objects.filter(news=draft_news)
+        assert notifications.count() == 5
+        assert set(notifications.values_list("status", flat=True)) == {
+            Notification.SENT
+        }
+
+    def test_publish_twice_alerts_once(
+        self, draft_news, readers, mailoutbox, chunk_size
+    ):
+        """Testa que publicar novamente não repete os alertas já enviados"""
+        tasks.publish_news(news_id=str(draft_news.id))
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        assert len(mailoutbox) == 5
+        assert Notification.objects.filter(news=draft_news).count() == 5
+        fanout = NotificationFanout.objects.filter(news=draft_news).first()
+        assert fanout.total_chunks == 0
+        assert fanout.finished_at is not None
+
+    def test_exclusive_news_recipients(
+        self, draft_news, readers, user_with_subscription, mailoutbox, chunk_size
+    ):
+        """Testa que notícias exclusivas só alertam assinantes das verticais"""
+        draft_news.is_exclusive = True
+        draft_news.verticals = user_with_subscription.subscription_plan.verticals
+        draft_news.save()
+
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        assert get_recipients(mailoutbox) == [user_with_subscription.email]
+
+    def test_failed_batch_is_retried(
+        self, draft_news, readers, mailoutbox, monkeypatch, chunk_size
+    ):
+        """Testa que um lote com falha volta para a fila após o intervalo"""
+        send_emails = tasks.send_emails
+        calls = []
+
+        def flaky_send_emails(*args, **kwargs):
+            calls.append(None)
+            if len(calls) == 1:
+                raise ConnectionError("SMTP indisponível")
+            return send_emails(*args, **kwargs)
+
+        monkeypatch.setattr(tasks, "send_emails", flaky_send_emails)
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        fanout = NotificationFanout.objects.get(news=draft_news)
+        notifications = Notification.objects.filter(news=draft_news)
+        assert len(calls) == 1
+        assert fanout.sent == 0
+        assert fanout.finished_at is not None
+        assert set(notifications.values_list("status", "attempts")) == {
+            (Notification.PENDING, 1)
+        }
+        assert all(
+            retry > timezone.now()
+            for retry in notifications.values_list("next_attempt_at", flat=True)
+        )
+
+        # Antes do intervalo o lote não é reenviado
+        assert tasks.drain_notifications() == 0
+        assert len(calls) == 1
+
+        notifications.update(next_attempt_at=timezone.now())
+        assert tasks.drain_notifications() == 5
+        assert len(calls) == 2
+        assert get_recipients(mailoutbox) == sorted(r.email for r in readers)
+        assert set(notifications.values_list("status", "attempts")) == {
+            (Notification.SENT, 2)
+        }
+
+    def test_retry_delay_doubles(self, draft_news, readers):
+        """Testa que o intervalo entre tentativas dobra a cada falha"""
+        Notification.objects.enqueue(
+            draft_news, User.objects.filter(pk__in=[r.pk for r in readers])
+        )
+        notifications = Notification.objects.filter(news=draft_news)
+        ids = list(notifications.values_list("id", flat=True))
+
+        delays = []
+        for _ in range(Notification.MAX_ATTEMPTS - 1):
+            before = timezone.now()
+            Notification.objects.mark_failed(ids)
+            delays.append(notifications.first().next_attempt_at - before)
+
+        assert Notification.RETRY_DELAY <= delays[0] < 2 * Notification.RETRY_DELAY
+        assert 2 * Notification.RETRY_DELAY <= delays[1] < 3 * Notification.RETRY_DELAY
+
+    def test_batch_failing_every_attempt(
+        self, draft_news, readers, monkeypatch, chunk_size
+    ):
+        """Testa que falhas persistentes não impedem a conclusão do envio"""
+
+        def broken_send_emails(*args, **kwargs):
+            raise ConnectionError("SMTP indisponível")
+
+        monkeypatch.setattr(tasks, "send_emails", broken_send_emails)
+        monkeypatch.setattr(Notification, "RETRY_DELAY", timedelta(0))
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        fanout = NotificationFanout.objects.get(news=draft_news)
+        assert fanout.failed_chunks == 0
+        assert fanout.sent == 0
+        assert fanout.finished_at is not None
+        notifications = Notification.objects.filter(news=draft_news)
+        assert set(notifications.values_list("status", "attempts")) == {
+            (Notification.FAILED, Notification.MAX_ATTEMPTS)
+        }
+
+
+@pytest.mark.django_db
+class TestPublishDueNews:
+    """Testes da varredura de publicação agendada"""
+
+    @pytest.fixture
+    def scheduled_news(self, draft_news, settings):
+        """Três rascunhos vencidos e um agendado para o futuro"""
+        settings.NEWS_PUBLISH_BATCH_SIZE = 2
+        now = timezone.now()
+        draft_news.published_at = now - timedelta(minutes=1)
+        draft_news.save()
+        news = [draft_news]
+        for i, delay in enumerate([-2, -3, 60]):
+            news.append(
+                New.objects.create(
+                    title=f"Agendada {i}",
+                    subtitle="Subtítulo",
+                    content="Conteúdo",
+                    picture=draft_news.picture.name,
+                    author=draft_news.author,
+                    status=New.DRAFT,
+                    published_at=now + timedelta(minutes=delay),
+                )
+            )
+        return news
+
+    def test_publishes_due_drafts(self, scheduled_news, readers, mailoutbox):
+        """Testa que apenas rascunhos vencidos são publicados, em lotes"""
+        assert not Schedule.objects.exists()
+
+        assert tasks.publish_due_news() == 3
+
+        statuses = New.objects.in_bulk([new.pk for new in scheduled_news])
+        assert [statuses[new.pk].status for new in scheduled_news] == [
+            New.PUBLISHED,
+            New.PUBLISHED,
+            New.PUBLISHED,
+            New.DRAFT,
+        ]
+        assert len(mailoutbox) == 3 * len(readers)
+        assert tasks.publish_due_news() == 0
+
+    def test_reschedule_is_a_column_update(self, scheduled_news):
+        """Testa que reagendar um rascunho só altera published_at"""
+        New.objects.filter(status=New.DRAFT).update(
+            published_at=timezone.now() + timedelta(hours=1)
+        )
+
+        assert tasks.publish_due_news() == 0
+        assert not New.objects.filter(status=New.PUBLISHED).exists()
+
+
+@pytest.mark.django_db
+class TestAudience:
+    """Testes do índice de audiência das notícias exclusivas"""
+
+    def get_audience(self, user):
+        return sorted(
+            Audience.objects.filter(user=user).values_list("vertical", flat=True)
+        )
+
+    def test_follows_user_plan(self, user_with_subscription, subscription_plan_premium):
+        """Testa que trocar de plano atualiza a audiência do leitor"""
+        assert self.get_audience(user_with_subscription) == ["power", "tax"]
+
+        user_with_subscription.subscription_plan = subscription_plan_premium
+        user_with_subscription.save()
+        assert len(self.get_audience(user_with_subscription)) == 5
+
+        user_with_subscription.subscription_plan = None
+        user_with_subscription.save()
+        assert self.get_audience(user_with_subscription) == []
+
+    def test_follows_plan_verticals(self, user_with_subscription, subscription_plan):
+        """Testa que alterar os verticais do plano atualiza seus assinantes"""
+        subscription_plan.verticals = [SubscriptionPlan.HEALTH]
+        subscription_plan.save()
+        assert self.get_audience(user_with_subscription) == ["health"]
+
+        subscription_plan.is_exclusive = False
+        subscription_plan.save()
+        assert self.get_audience(user_with_subscription) == []
+
+    def test_unrelated_update_skips_rebuild(self, user_with_subscription, monkeypatch):
+        """Testa que salvar outros campos não recalcula a audiência"""
+        rebuild = Mock()
+        monkeypatch.setattr(Audience.objects, "rebuild", rebuild)
+
+        user_with_subscription.save(update_fields=["last_login"])
+        assert not rebuild.called
+        user_with_subscription.save(update_fields=["subscription_plan"])
+        assert rebuild.called
+
+    def test_recipients_union(self, readers, subscription_plan):
+        """Testa a união das audiências dos verticais da notícia"""
+        health = SubscriptionPlan.objects.create(
+            name="Saúde",
+            price=10,
+            is_exclusive=True,
+            verticals=[SubscriptionPlan.HEALTH],
+        )
+        readers[0].subscription_plan = subscription_plan
+        readers[0].save()
+        readers[1].subscription_plan = health
+        readers[1].save()
+        news = New(is_exclusive=True, verticals=["tax", "health"])
+
+        recipients = tasks.get_recipients(news).values_list("id", flat=True)
+        assert set(recipients) == {readers[0].id, readers[1].id}
+        news.verticals = ["labor"]
+        assert not tasks.get_recipients(news).exists()
+
+    def test_rebuild_command(self, user_with_subscription):
+        """Testa a reconstrução após alterações em massa"""
+        User.objects.filter(pk=user_with_subscription.pk).update(subscription_plan=None)
+        call_command("rebuild_audience", stdout=io.StringIO())
+
+        assert self.get_audience(user_with_subscription) == []
+
+
+@pytest.mark.django_db
+class TestNotificationOutbox:
+    """Testes da fila de saída de alertas"""
+
+    def test_enqueue_skips_existing(self, draft_news, readers):
+        """Testa que a inserção em lote ignora leitores já enfileirados"""
+        users = User.objects.filter(id__in=[r.id for r in readers])
+
+        assert Notification.objects.enqueue(draft_news, users[:2]) == 2
+        assert Notification.objects.enqueue(draft_news, users) == 3
+        assert Notification.objects.filter(news=draft_news).count() == 5
+
+    def test_claim_pending_only(self, draft_news, readers):
+        """Testa que apenas alertas pendentes são reservados"""
+        Notification.objects.enqueue(
+            draft_news, User.objects.filter(id__in=[r.id for r in readers])
+        )
+        sent = Notification.objects.order_by("id").first()
+        Notification.objects.mark_sent([sent.id])
+
+        with transaction.atomic():
+            rows = Notification.objects.claim(10, draft_news.id)
+
+        assert len(rows) == 4
+        assert sent.id not in [pk for pk, _, _ in rows]
+        assert {email for _, _, email in rows} < {r.email for r in readers}
+
+    def test_drain_resumes_pending(self, draft_news, readers, mailoutbox):
+        """Testa que o despachante sem argumentos retoma os alertas pendentes"""
+        Notification.objects.enqueue(
+            draft_news, User.objects.filter(id__in=[r.id for r in readers])
+        )
+
+        assert tasks.drain_notifications() == 5
+        assert get_recipients(mailoutbox) == sorted(r.email for r in readers)
+        assert tasks.drain_notifications() == 0
+
+
+@pytest.mark.django_db
+class TestSendDigest:
+    """Testes do resumo periódico de notícias"""
+
+    @pytest.fixture
+    def hourly_readers(self, readers, subscription_plan):
+        """Dois assinantes e um leitor sem plano que preferem o resumo por hora"""
+        for reader in readers[:3]:
+            reader.notification_frequency = User.HOURLY
+        for reader in readers[:2]:
+            reader.subscription_plan = subscription_plan
+        User.objects.bulk_update(
+            readers[:3], ["notification_frequency", "subscription_plan"]
+        )
+        return readers[:3]
+
+    @pytest.fixture
+    def recent_news(self, published_news, exclusive_news, draft_news):
+        """Notícias publicadas há poucos minutos"""
+        published_at = timezone.now() - timedelta(minutes=5)
+        draft_news.status = New.PUBLISHED
+        draft_news.is_exclusive = True
+        draft_news.save()
+        New.objects.update(published_at=published_at, notified_at=published_at)
+        return published_news, exclusive_news, draft_news
+
+    def test_digest_per_entitlement(self, hourly_readers, recent_news, mailoutbox):
+        """Testa que cada direito de acesso recebe um único resumo renderizado"""
+        published, exclusive, health = recent_news
+
+        assert tasks.send_digest(User.HOURLY) == 3
+
+        bodies = {message.to[0]: message.body for message in mailoutbox}
+        assert set(bodies) == {reader.email for reader in hourly_readers}
+        subscriber_body = bodies[hourly_readers[0].email]
+        assert subscriber_body == bodies[hourly_readers[1].email]
+        assert published.title in subscriber_body
+        assert exclusive.title in subscriber_body
+        assert health.title not in subscriber_body
+        reader_body = bodies[hourly_readers[2].email]
+        assert published.title in reader_body
+        assert exclusive.title not in reader_body
+        digest = NotificationDigest.objects.get()
+        assert (digest.articles, digest.digests, digest.sent) == (3, 2, 3)
+
+    def test_digest_window(self, hourly_readers, recent_news, mailoutbox):
+        """Testa que cada notícia entra em um único resumo"""
+        tasks.send_digest(User.HOURLY)
+        mailoutbox.clear()
+
+        assert tasks.send_digest(User.HOURLY) == 0
+        assert mailoutbox == []
+        first, second = NotificationDigest.objects.order_by("until")
+        assert second.since == first.until
+
+    def test_digest_late_publication(self, draft_news, hourly_readers, mailoutbox):
+        """Testa que um rascunho agendado no passado entra no próximo resumo"""
+        tasks.send_digest(User.HOURLY)
+        draft_news.published_at = timezone.now() - timedelta(hours=2)
+        draft_news.save()
+
+        assert tasks.publish_due_news() == 1
+        mailoutbox.clear()
+
+        assert tasks.send_digest(User.HOURLY) == 3
+        assert draft_news.title in mailoutbox[0].body
+        assert NotificationDigest.objects.order_by("until").last().articles == 1
+
+    def test_digest_skips_silent_news(self, draft_news, hourly_readers, mailoutbox):
+        """Testa que notícias importadas sem alertas não entram no resumo"""
+        draft_news.published_at = timezone.now() - timedelta(minutes=1)
+        draft_news.notify = False
+        draft_news.save()
+        tasks.publish_due_news()
+
+        assert tasks.send_digest(User.HOURLY) == 0
+        assert mailoutbox == []
+
+    def test_digest_readers_skip_immediate_alerts(
+        self, draft_news, hourly_readers, readers, mailoutbox
+    ):
+        """Testa que leitores do resumo não recebem o alerta imediato"""
+        tasks.publish_news(news_id=str(draft_news.id))
+
+        assert get_recipients(mailoutbox) == sorted(r.email for r in readers[3:])
+
+
+class TestSendEmails:
+    """Testes do envio em lotes reutilizando a conexão SMTP"""
+
+    def test_batches_share_one_connection(self, mailoutbox):
+        """Testa que todos os lotes usam uma única conexão"""
+        connection = get_connection()
+        connection.open = Mock(wraps=connection.open)
+        connection.send_messages = Mock(wraps=connection.send_messages)
+        recipients = (f"reader_{i}@test.com" for i in range(5))
+
+        sent = tasks.send_emails("Assunto", "Corpo", recipients, 2, connection)
+
+        assert sent == 5
+        assert connection.open.call_count == 1
+        assert [len(c.args[0]) for c in connection.send_messages.call_args_list] == [
+            2,
+            2,
+            1,
+        ]
+        assert [message.to for message in mailoutbox][0] == ["reader_0@test.com"]
+
+    def test_pipelining_backend(self):
+        """Testa o envio com PIPELINING contra um servidor SMTP local"""
+        sink = SMTPSink()
+        connection = get_connection(
+            "setting.mail.PipeliningEmailBackend",
+            host="127.0.0.1",
+            port=sink.port,
+            username="",
+            password="",
+            use_tls=False,
+            use_ssl=False,
+        )
+        try:
+            recipients = [f"reader_{i}@test.com" for i in range(3)]
+            sent = tasks.send_emails("Assunto", ".Corpo", recipients, 2, connection)
+        finally:
+            sink.stop()
+
+        assert sent == 3
+        assert sink.received == 3
+        assert sink.connections == 1
@@ -1,5 +1,13 @@
 from django.urls import path, include
 
+from apps.news.api.async_views import NewAsyncListView, NewAsyncDetailView
+
 urlpatterns = [
     path("", include("apps.news.api.urls")),
+    path("async/news/", NewAsyncListView.as_view(), name="news-async-list"),
+    path(
+        "async/news/<uuid:pk>/",
+        NewAsyncDetailView.as_view(),
+        name="news-async-detail",
+    ),
 ]
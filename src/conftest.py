@@ -6,6 +6,7 @@ import io
 
 import pytest
 from PIL import Image
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -16,6 +17,14 @@ from apps.account.models import SubscriptionPlan
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Limpa o cache entre os testes"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Cliente API para testes"""
@@ -0,0 +1,78 @@
+import re
+import smtplib
+
+from django.conf import settings
+from django.core.mail.message import sanitize_address
+from django.core.mail.backends.smtp import EmailBackend
+
+CRLF = b"\r\n"
+LEADING_PERIOD = re.compile(rb"(?m)^\.")
+
+
+class PipeliningEmailBackend(EmailBackend):
+    """
+    SMTP backend that sends MAIL FROM, every RCPT TO and DATA of a message
+    in a single round trip when the server supports PIPELINING (RFC 2920),
+    instead of one round trip per command. Falls back to the plain SMTP
+    backend otherwise.
+    """
+
+    def _send(self, email_message):
+        self.connection.ehlo_or_helo_if_needed()
+        if not self.connection.has_extn("pipelining"):
+            return super()._send(email_message)
+        if not email_message.recipients():
+            return False
+        encoding = email_message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(email_message.from_email, encoding)
+        recipients = [
+            sanitize_address(addr, encoding) for addr in email_message.recipients()
+        ]
+        message = email_message.message()
+        try:
+            self.pipeline(from_email, recipients, message.as_bytes(linesep="\r\n"))
+        except smtplib.SMTPException:
+            if not self.fail_silently:
+                raise
+            return False
+        return True
+
+    def pipeline(self, from_email, recipients, data):
+        connection = self.connection
+        size = f" SIZE={len(data)}" if connection.has_extn("size") else ""
+        commands = [f"MAIL FROM:{smtplib.quoteaddr(from_email)}{size}"]
+        commands += [f"RCPT TO:{smtplib.quoteaddr(address)}" for address in recipients]
+        commands.append("DATA")
+        connection.send("".join(f"{command}\r\n" for command in commands))
+
+        # Every reply of the group must be read, whatever the outcome
+        mail_reply = connection.getreply()
+        refused = {}
+        for address in recipients:
+            code, response = connection.getreply()
+            if code not in (250, 251):
+                refused[address] = (code, response)
+        data_code, data_response = connection.getreply()
+
+        error = None
+        if mail_reply[0] != 250:
+            error = smtplib.SMTPSenderRefused(*mail_reply, from_email)
+        elif len(refused) == len(recipients):
+            error = smtplib.SMTPRecipientsRefused(refused)
+        if error is not None or data_code != 354:
+            if data_code == 354:
+                # Close the data section opened despite the errors
+                connection.send(b"." + CRLF)
+                connection.getreply()
+            connection.rset()
+            raise error or smtplib.SMTPDataError(data_code, data_response)
+
+        data = LEADING_PERIOD.sub(b"..", data)
+        if not data.endswith(CRLF):
+            data += CRLF
+        connection.send(data + b"." + CRLF)
+        code, response = connection.getreply()
+        if code != 250:
+            connection.rset()
+            raise smtplib.SMTPDataError(code, response)
+        return refused
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.middleware.gzip import GZipMiddleware
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that prefers Brotli when the client accepts it and skips
+    responses smaller than ``settings.COMPRESSION_MIN_LENGTH`` bytes.
+    """
+
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        min_length = getattr(settings, "COMPRESSION_MIN_LENGTH", 1024)
+        if not response.streaming and len(response.content) < min_length:
+            return response
+
+        ae = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not re_accepts_brotli.search(ae)
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed_content = brotli.compress(
+            response.content, quality=self.brotli_quality
+        )
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers["Content-Length"] = str(len(response.content))
+
+        # Same as GZipMiddleware, the encoded representation gets a weak ETag
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
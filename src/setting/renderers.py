@@ -0,0 +1,47 @@
+import orjson
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def default(obj):
+    """
+    Types orjson does not handle natively (Decimal, lazy translations,
+    querysets, timedelta...) are encoded as DRF's JSONEncoder does.
+    """
+    return JSONEncoder().default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in replacement of DRF's JSONRenderer built on orjson.
+
+    UUIDs and datetimes are encoded natively (UTC as ``Z``, like DRF).
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+
+class ORJSONParser(BaseParser):
+    """
+    Drop-in replacement of DRF's JSONParser built on orjson.
+    """
+
+    media_type = "application/json"
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
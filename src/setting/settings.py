@@ -62,13 +62,14 @@ INSTALLED_APPS = (
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "setting.middlewares.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "author.middlewares.AuthorDefaultBackendMiddleware",
+    "apps.account.middlewares.AuthorMiddleware",
 ]
 
 ROOT_URLCONF = "setting.urls"
@@ -142,6 +143,15 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# New.picture stores each distinct upload once, under its content hash
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "news_pictures": {"BACKEND": "apps.news.storage.ContentAddressedStorage"},
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -156,6 +166,15 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.BasicAuthentication",
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "setting.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "setting.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": [
@@ -191,13 +210,18 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
-    "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_OBTAIN_SERIALIZER": "apps.account.serializers.EntitlementTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.account.serializers.EntitlementTokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "SLIDING_TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer",
     "SLIDING_TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSlidingSerializer",
 }
+
+# Access tokens carry the entitlement of their user (type, plan verticals),
+# so news reads skip the user query; revoked on entitlement change
+ACCOUNT_STATELESS_JWT = config("ACCOUNT_STATELESS_JWT", default=False, cast=bool)
+
 AUTH_USER_MODEL = "account.User"
 
 Q_CLUSTER = {
@@ -205,6 +229,8 @@ Q_CLUSTER = {
     "workers": 4,
     "timeout": 3600,
     "label": "Django Q2",
+    # Workers must be able to fork the picture derivatives process pool
+    "daemonize_workers": False,
     "redis": {
         "host": config("REDIS_HOST"),
         "port": config("REDIS_PORT"),
@@ -214,3 +240,52 @@ Q_CLUSTER = {
 
 
 AUTHOR_CREATED_BY_FIELD_NAME = "created_by"
+AUTHOR_BACKEND = "apps.account.backends.AuthorBackend"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://{}:{}/{}".format(
+            config("REDIS_HOST"), config("REDIS_PORT"), config("REDIS_DB")
+        ),
+    }
+}
+
+# Seconds an entitlement feed page stays cached (invalidated on article change)
+NEWS_FEED_CACHE_TIMEOUT = config("NEWS_FEED_CACHE_TIMEOUT", default=60, cast=int)
+
+# Seconds a single article payload stays cached (invalidated on change)
+NEWS_ARTICLE_CACHE_TIMEOUT = config("NEWS_ARTICLE_CACHE_TIMEOUT", default=300, cast=int)
+
+# Show scheduled drafts as soon as their published_at passes, without waiting
+# for publish_due_news (feed pages then expire at the next published_at)
+NEWS_EMBARGO_VISIBILITY = config("NEWS_EMBARGO_VISIBILITY", default=False, cast=bool)
+
+# Responses smaller than this are not worth compressing
+COMPRESSION_MIN_LENGTH = 1024
+
+# Processes resizing news pictures, None for one per CPU and 0 to resize in
+# the django-q worker itself
+NEWS_IMAGE_WORKERS = config(
+    "NEWS_IMAGE_WORKERS", default="", cast=lambda v: int(v) if v else None
+)
+
+# Pending alerts per outbox dispatcher, dispatchers run in parallel
+NEWS_NOTIFICATION_CHUNK_SIZE = config(
+    "NEWS_NOTIFICATION_CHUNK_SIZE", default=1000, cast=int
+)
+
+# Due drafts published per transaction by the publish_due_news sweep
+NEWS_PUBLISH_BATCH_SIZE = config("NEWS_PUBLISH_BATCH_SIZE", default=500, cast=int)
+
+# Outgoing email (news alerts)
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="setting.mail.PipeliningEmailBackend")
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=25, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="webmaster@localhost")
+
+# Alert messages handed to the SMTP connection at a time
+NEWS_EMAIL_BATCH_SIZE = config("NEWS_EMAIL_BATCH_SIZE", default=100, cast=int)